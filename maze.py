@@ -1,27 +1,2765 @@
 import tkinter as tk
 import random
-from collections import deque
+from collections import OrderedDict, deque, namedtuple
 import heapq
+import itertools
+import argparse
+import base64
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from abc import ABC, abstractmethod
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from types import SimpleNamespace
+
+try:
+    import pygame
+except ImportError:  # pygame is optional; the Tk renderer is always available
+    pygame = None
 
 # Define the size of the maze
 WIDTH = 31  # Must be an odd number
 HEIGHT = 31  # Must be an odd number
 CELL_SIZE = 20
+# Largest side of the drawn board in pixels; bigger mazes get smaller cells (see `fit_cell_size`)
+MAX_BOARD_SIZE = 1000
 
 # Directions for moving in the maze (right, left, down, up)
 DIRS = [(2, 0), (-2, 0), (0, 2), (0, -2)]
 MOVE_DIRS = {"Right": (1, 0), "Left": (-1, 0), "Down": (0, 1), "Up": (0, -1)}
 
+# Number of items placed by the Items button in collection mode
+ITEM_COUNT = 8
+
+# Frame rate of the pygame renderer and the delay (in ms) between search animation steps
+FPS = 60
+STEP_DELAY = 50
+
+# RGB values for the Tk color names used when drawing, so every renderer shows the same palette
+COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "green": (0, 255, 0),
+    "red": (255, 0, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "orange": (255, 165, 0),
+    "purple": (160, 32, 240),
+    "magenta": (255, 0, 255),
+    "gold": (255, 215, 0),
+    "cyan": (0, 255, 255),
+    "light blue": (173, 216, 230),
+    "light green": (144, 238, 144),
+    "gray": (190, 190, 190),
+}
+
+
+class Renderer(ABC):
+    """
+    Base class for the drawing backends used by `MazeGame`.
+
+    A renderer owns the window, draws maze cells and the player, exposes buttons and keyboard
+    input, and runs the event loop. `MazeGame` only talks to this interface, so the game logic
+    and the search animations are identical whichever backend is selected.
+
+    Attributes:
+        width (int): The width of the maze in cells.
+        height (int): The height of the maze in cells.
+        cell_size (int): The size of each cell in pixels.
+        title (str): The window title.
+        outlined (bool): Whether cells and the player get a black outline; cells smaller than
+            `MIN_OUTLINED_CELL_SIZE` are filled edge to edge, since the outline would cover them.
+
+    Notes:
+        - Colors are given as names from `COLORS` (which are also valid Tk color names).
+        - Key events are delivered to the bound handler as objects with a Tk-style `keysym`
+          attribute (e.g. "Up", "Down", "Left", "Right"), so keyboard controls are shared.
+        - Every method except `__init__` is abstract, so a backend that misses one fails as
+          soon as it is created rather than on the first click or key press.
+    """
+
+    MIN_OUTLINED_CELL_SIZE = 4
+
+    def __init__(self, width, height, cell_size, title):
+        """
+        Initializes the renderer.
+
+        Args:
+            width (int): The width of the maze in cells.
+            height (int): The height of the maze in cells.
+            cell_size (int): The size of each cell in pixels.
+            title (str): The window title.
+        """
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.title = title
+        self.outlined = cell_size >= self.MIN_OUTLINED_CELL_SIZE
+
+    @abstractmethod
+    def add_button(self, text, command):
+        """
+        Adds a button that calls `command` (with no arguments) when clicked, and returns it.
+        """
+
+    @abstractmethod
+    def add_slider(self, command):
+        """
+        Adds a horizontal slider that calls `command(value)` with an int when moved, and returns it.
+        """
+
+    @abstractmethod
+    def update_slider(self, slider, value, maximum):
+        """
+        Moves `slider` to `value` on a scale from 0 to `maximum`, without calling its command.
+        """
+
+    @abstractmethod
+    def bind_keys(self, handler):
+        """
+        Registers `handler(event)` to be called for every key press.
+        """
+
+    @abstractmethod
+    def fill_cell(self, x, y, color):
+        """
+        Paints the maze cell at `(x, y)` with `color`.
+        """
+
+    @abstractmethod
+    def set_player(self, x, y):
+        """
+        Draws the player at `(x, y)`, removing it from its previous position.
+        """
+
+    @abstractmethod
+    def show_text(self, text, color):
+        """
+        Shows `text` centered over the maze.
+        """
+
+    @abstractmethod
+    def show_report(self, title, text):
+        """
+        Shows a block of monospaced `text` (such as a results table) under the heading `title`.
+        """
+
+    @abstractmethod
+    def after(self, ms, callback):
+        """
+        Schedules `callback` (with no arguments) to run after `ms` milliseconds.
+        """
+
+    @abstractmethod
+    def refresh(self):
+        """
+        Pushes pending drawing operations to the screen.
+        """
+
+    @abstractmethod
+    def run(self):
+        """
+        Runs the event loop until the window is closed.
+        """
+
+
+class TkRenderer(Renderer):
+    """
+    Renderer that draws the maze on a Tkinter canvas.
+
+    Each cell is drawn once as a canvas rectangle and later recolored in place with
+    `itemconfig`, so repeated painting does not keep growing the canvas item list.
+
+    Attributes:
+        root (tk.Tk): The main Tkinter window.
+        canvas (tk.Canvas): The canvas used to draw the maze and player.
+        cells (dict[tuple[int, int], int]): Canvas item id of the rectangle for each cell.
+        player (int | None): Canvas item id of the player rectangle, once drawn.
+    """
+
+    def __init__(self, width, height, cell_size, title):
+        super().__init__(width, height, cell_size, title)
+        self.root = tk.Tk()  # Initialize the Tkinter root window
+        self.root.title(title)
+        self.canvas = tk.Canvas(
+            self.root,
+            width=width * cell_size,
+            height=height * cell_size,
+            bg="black",
+        )
+        self.canvas.pack()
+        self.cells = {}
+        self.player = None
+
+    def add_button(self, text, command):
+        button = tk.Button(self.root, text=text, command=command)
+        button.pack(side=tk.LEFT, padx=5, pady=5)
+        return button
+
+    def add_slider(self, command):
+        def moved(value):
+            value = int(float(value))
+            # Scale.set() also calls the command (later, when Tk is idle), so skip the value
+            # that update_slider set and only report moves made by the user
+            if value != slider.set_value:
+                slider.set_value = None
+                command(value)
+
+        slider = tk.Scale(
+            self.root,
+            from_=0,
+            to=0,
+            orient=tk.HORIZONTAL,
+            showvalue=False,
+            command=moved,
+        )
+        slider.set_value = None
+        slider.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=5)
+        return slider
+
+    def update_slider(self, slider, value, maximum):
+        slider.configure(to=maximum)
+        slider.set_value = value
+        slider.set(value)
+
+    def bind_keys(self, handler):
+        self.root.bind("<KeyPress>", handler)
+
+    def fill_cell(self, x, y, color):
+        item = self.cells.get((x, y))
+        if item is not None:
+            self.canvas.itemconfig(item, fill=color)
+            return
+        self.cells[(x, y)] = self.canvas.create_rectangle(
+            x * self.cell_size,
+            y * self.cell_size,
+            (x + 1) * self.cell_size,
+            (y + 1) * self.cell_size,
+            fill=color,
+            outline="black" if self.outlined else "",
+        )
+        if self.player is not None:
+            self.canvas.tag_raise("player")  # Keep the player above newly created cells
+
+    def set_player(self, x, y):
+        coords = (
+            x * self.cell_size,
+            y * self.cell_size,
+            (x + 1) * self.cell_size,
+            (y + 1) * self.cell_size,
+        )
+        if self.player is None:
+            self.player = self.canvas.create_rectangle(
+                *coords,
+                fill="blue",
+                outline="black" if self.outlined else "",
+                tags="player",
+            )
+        else:
+            self.canvas.coords(self.player, *coords)
+
+    def show_text(self, text, color):
+        self.canvas.create_text(
+            self.width * self.cell_size / 2,
+            self.height * self.cell_size / 2,
+            text=text,
+            fill=color,
+            font=("Helvetica", 24),
+        )
+
+    def show_report(self, title, text):
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        tk.Label(window, text=text, font=("Courier", 12), justify=tk.LEFT).pack(
+            padx=10, pady=10
+        )
+
+    def after(self, ms, callback):
+        self.root.after(ms, callback)
+
+    def refresh(self):
+        self.canvas.update_idletasks()
+
+    def run(self):
+        self.root.mainloop()  # Start the Tkinter event loop
+
+
+class PygameRenderer(Renderer):
+    """
+    Renderer that draws the maze with pygame, using surface blits and dirty-rect updates.
+
+    Cells are painted onto an off-screen `board` surface. Every frame, only the screen regions
+    that changed since the previous frame are re-blitted from the board and sent to the display,
+    which keeps large mazes and fast searches at a steady frame rate. The event loop uses a fixed
+    timestep: scheduled callbacks (see `after`) are advanced in `1000 / FPS` ms increments, so the
+    animation speed does not depend on how long a frame took to draw.
+
+    Attributes:
+        screen (pygame.Surface): The display surface (the maze plus button rows and a slider row underneath).
+        board (pygame.Surface): Off-screen surface holding the painted maze cells.
+        font (pygame.font.Font): Font used for button labels.
+        message_font (pygame.font.Font): Font used for messages shown over the maze.
+        buttons (list[tuple[pygame.Rect, str, callable]]): Button areas, labels and commands.
+        button_rows (int): Number of button rows; buttons wrap to a new row when the window is full.
+        sliders (list[SimpleNamespace]): Sliders, each with `rect`, `command`, `value` and `maximum`.
+        dragging (SimpleNamespace | None): The slider being dragged with the mouse.
+        key_handler (callable | None): Handler registered with `bind_keys`.
+        player (pygame.Rect | None): Screen area covered by the player.
+        message (tuple[pygame.Surface, pygame.Rect] | None): Rendered message and its position.
+        report (tuple[pygame.Surface, pygame.Rect] | None): Rendered report panel and its position;
+            clicking it dismisses it.
+        timers (list[tuple[float, int, callable]]): Heap of scheduled callbacks (due time, order, callback).
+        clock_ms (float): Simulated time in milliseconds, advanced in fixed steps.
+        dirty (list[pygame.Rect]): Screen areas that must be redrawn on the next frame.
+        full_redraw (bool): Whether the next frame must redraw the whole window.
+        running (bool): Whether the event loop is running.
+
+    Notes:
+        - Keys are translated to Tk-style `keysym` names, so `MazeGame` handles them the same way
+          as with the Tk renderer.
+        - When more than `MAX_DIRTY_RECTS` areas change in one frame, the whole window is redrawn
+          instead, which is cheaper than updating many tiny rectangles.
+    """
+
+    BAR_HEIGHT = 36
+    SLIDER_HEIGHT = 16
+    MAX_DIRTY_RECTS = 256
+    MAX_FRAME_LAG = 250  # ms; avoids a burst of catch-up steps after the window stalls
+
+    def __init__(self, width, height, cell_size, title):
+        if pygame is None:
+            raise RuntimeError("The pygame renderer requires pygame to be installed.")
+        super().__init__(width, height, cell_size, title)
+        pygame.init()
+        board_size = (width * cell_size, height * cell_size)
+        self.button_rows = 1
+        self.screen = pygame.display.set_mode(
+            (board_size[0], board_size[1] + self.BAR_HEIGHT + self.SLIDER_HEIGHT)
+        )
+        pygame.display.set_caption(title)
+        self.board = pygame.Surface(board_size).convert()
+        self.board.fill(COLORS["black"])
+        self.font = pygame.font.SysFont("helvetica", 16)
+        self.report_font = pygame.font.SysFont("courier", 14)
+        self.message_font = pygame.font.SysFont("helvetica", 24)
+        self.buttons = []
+        self.sliders = []
+        self.dragging = None
+        self.key_handler = None
+        self.player = None
+        self.message = None
+        self.report = None
+        self.timers = []
+        # Keeps callbacks due at the same time in FIFO order
+        self.timer_order = itertools.count()
+        self.clock_ms = 0.0
+        self.dirty = []
+        self.full_redraw = True
+        self.running = False
+        self.keysyms = {
+            pygame.K_RIGHT: "Right",
+            pygame.K_LEFT: "Left",
+            pygame.K_DOWN: "Down",
+            pygame.K_UP: "Up",
+            pygame.K_SPACE: "space",
+            pygame.K_PERIOD: "period",
+            pygame.K_COMMA: "comma",
+            pygame.K_HOME: "Home",
+            pygame.K_END: "End",
+            pygame.K_PLUS: "plus",
+            pygame.K_KP_PLUS: "plus",
+            pygame.K_EQUALS: "equal",
+            pygame.K_MINUS: "minus",
+            pygame.K_KP_MINUS: "minus",
+        }
+
+    def cell_rect(self, x, y):
+        """
+        Returns the screen rectangle covered by the cell at `(x, y)`.
+        """
+        return pygame.Rect(
+            x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size
+        )
+
+    def mark_dirty(self, rect):
+        """
+        Records that `rect` must be redrawn on the next frame.
+        """
+        if self.full_redraw:
+            return
+        if len(self.dirty) >= self.MAX_DIRTY_RECTS:
+            self.full_redraw = True
+            self.dirty.clear()
+            return
+        self.dirty.append(rect)
+
+    def add_button(self, text, command):
+        label = self.font.render(text, True, COLORS["black"])
+        rect = pygame.Rect(5, 0, label.get_width() + 16, self.BAR_HEIGHT - 10)
+        if self.buttons:
+            rect.left = self.buttons[-1][0].right + 10
+        if rect.right > self.width * self.cell_size and self.buttons:
+            rect.left = 5
+            self.button_rows += 1
+            self.resize()
+        bar_top = (
+            self.height * self.cell_size + (self.button_rows - 1) * self.BAR_HEIGHT
+        )
+        rect.top = bar_top + 5
+        self.buttons.append((rect, text, command))
+        self.full_redraw = True
+        return rect
+
+    def resize(self):
+        """
+        Resizes the window to fit the button rows, keeping sliders in the bottom row.
+        """
+        slider_top = self.height * self.cell_size + self.button_rows * self.BAR_HEIGHT
+        self.screen = pygame.display.set_mode(
+            (self.width * self.cell_size, slider_top + self.SLIDER_HEIGHT)
+        )
+        for slider in self.sliders:
+            slider.rect.top = slider_top
+        self.full_redraw = True
+
+    def add_slider(self, command):
+        rect = pygame.Rect(
+            5,
+            self.height * self.cell_size + self.button_rows * self.BAR_HEIGHT,
+            self.width * self.cell_size - 10,
+            self.SLIDER_HEIGHT - 4,
+        )
+        slider = SimpleNamespace(rect=rect, command=command, value=0, maximum=0)
+        self.sliders.append(slider)
+        self.full_redraw = True
+        return slider
+
+    def update_slider(self, slider, value, maximum):
+        slider.value = value
+        slider.maximum = maximum
+        self.mark_dirty(slider.rect)
+
+    def drag_slider(self, slider, x):
+        """
+        Moves `slider` to the value under the mouse position `x` and calls its command.
+        """
+        fraction = (x - slider.rect.left) / max(slider.rect.width, 1)
+        value = round(min(max(fraction, 0.0), 1.0) * slider.maximum)
+        if value != slider.value:
+            self.update_slider(slider, value, slider.maximum)
+            slider.command(value)
+
+    def bind_keys(self, handler):
+        self.key_handler = handler
+
+    def fill_cell(self, x, y, color):
+        rect = self.cell_rect(x, y)
+        self.board.fill(COLORS[color], rect)
+        if self.outlined:
+            pygame.draw.rect(self.board, COLORS["black"], rect, 1)  # Cell outline
+        self.mark_dirty(rect)
+
+    def set_player(self, x, y):
+        if self.player is not None:
+            self.mark_dirty(self.player)
+        self.player = self.cell_rect(x, y)
+        self.mark_dirty(self.player)
+
+    def show_text(self, text, color):
+        surface = self.message_font.render(text, True, COLORS[color])
+        rect = surface.get_rect(
+            center=(self.width * self.cell_size / 2, self.height * self.cell_size / 2)
+        )
+        self.message = (surface, rect)
+        self.mark_dirty(rect)
+
+    def show_report(self, title, text):
+        lines = [self.font.render(title, True, COLORS["black"])]
+        lines += [
+            self.report_font.render(line, True, COLORS["black"])
+            for line in text.splitlines()
+        ]
+        width = max(line.get_width() for line in lines) + 20
+        height = sum(line.get_height() + 4 for line in lines) + 16
+        panel = pygame.Surface((width, height)).convert()
+        panel.fill(COLORS["white"])
+        pygame.draw.rect(panel, COLORS["black"], panel.get_rect(), 1)
+        top = 8
+        for line in lines:
+            panel.blit(line, (10, top))
+            top += line.get_height() + 4
+        if self.report is not None:
+            self.mark_dirty(self.report[1])
+        rect = panel.get_rect(
+            center=(self.width * self.cell_size / 2, self.height * self.cell_size / 2)
+        )
+        self.report = (panel, rect)
+        self.mark_dirty(rect)
+
+    def after(self, ms, callback):
+        heapq.heappush(
+            self.timers, (self.clock_ms + ms, next(self.timer_order), callback)
+        )
+
+    def refresh(self):
+        pass  # The frame loop presents pending changes once per frame
+
+    def run_timers(self):
+        """
+        Runs every scheduled callback whose due time has been reached.
+        """
+        while self.timers and self.timers[0][0] <= self.clock_ms:
+            _, _, callback = heapq.heappop(self.timers)
+            callback()
+
+    def handle_event(self, event):
+        """
+        Dispatches a pygame event to the key handler, a button, or closes the window.
+        """
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.KEYDOWN and self.key_handler is not None:
+            keysym = self.keysyms.get(event.key, event.unicode)
+            self.key_handler(SimpleNamespace(keysym=keysym))
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.report is not None and self.report[1].collidepoint(event.pos):
+                self.mark_dirty(self.report[1])
+                self.report = None  # Dismiss the report
+                return
+            for rect, _, command in self.buttons:
+                if rect.collidepoint(event.pos):
+                    command()
+                    return
+            for slider in self.sliders:
+                if slider.rect.collidepoint(event.pos):
+                    self.dragging = slider
+                    self.drag_slider(slider, event.pos[0])
+                    return
+        elif event.type == pygame.MOUSEMOTION and self.dragging is not None:
+            self.drag_slider(self.dragging, event.pos[0])
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.dragging = None
+
+    def draw_buttons(self):
+        """
+        Draws the button bar and slider row below the maze.
+        """
+        bar = pygame.Rect(
+            0,
+            self.height * self.cell_size,
+            self.width * self.cell_size,
+            self.button_rows * self.BAR_HEIGHT + self.SLIDER_HEIGHT,
+        )
+        self.screen.fill(COLORS["white"], bar)
+        for rect, text, _ in self.buttons:
+            self.screen.fill(COLORS["gray"], rect)
+            pygame.draw.rect(self.screen, COLORS["black"], rect, 1)
+            label = self.font.render(text, True, COLORS["black"])
+            self.screen.blit(label, label.get_rect(center=rect.center))
+
+    def draw_sliders(self):
+        """
+        Draws each slider as a track with a handle at its current value.
+        """
+        for slider in self.sliders:
+            self.screen.fill(COLORS["white"], slider.rect)
+            track = slider.rect.inflate(0, -slider.rect.height + 2)
+            self.screen.fill(COLORS["gray"], track)
+            fraction = slider.value / slider.maximum if slider.maximum else 0.0
+            handle = pygame.Rect(0, slider.rect.top, 8, slider.rect.height)
+            handle.centerx = slider.rect.left + round(fraction * slider.rect.width)
+            self.screen.fill(COLORS["blue"], handle.clamp(slider.rect))
+
+    def present(self):
+        """
+        Draws the current frame, updating only the dirty areas of the display when possible.
+        """
+        if self.full_redraw:
+            self.screen.blit(self.board, (0, 0))
+            self.draw_buttons()
+        elif not self.dirty:
+            return
+        else:
+            for rect in self.dirty:
+                self.screen.blit(self.board, rect, rect)
+        if self.player is not None:
+            self.screen.fill(COLORS["blue"], self.player)
+            if self.outlined:
+                pygame.draw.rect(self.screen, COLORS["black"], self.player, 1)
+        if self.message is not None:
+            self.screen.blit(*self.message)
+        if self.report is not None:
+            self.screen.blit(*self.report)
+        self.draw_sliders()
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty)
+        self.full_redraw = False
+        self.dirty.clear()
+
+    def run(self):
+        clock = pygame.time.Clock()
+        step = 1000.0 / FPS
+        lag = 0.0
+        self.running = True
+        while self.running:
+            lag = min(lag + clock.tick(FPS), self.MAX_FRAME_LAG)
+            for event in pygame.event.get():
+                self.handle_event(event)
+            # Advance scheduled callbacks in fixed increments, independent of frame time
+            while lag >= step and self.running:
+                self.clock_ms += step
+                self.run_timers()
+                lag -= step
+            self.present()
+        pygame.quit()
+
+
+def fit_cell_size(width, height, max_board_size=MAX_BOARD_SIZE):
+    """
+    Returns the largest cell size, up to `CELL_SIZE`, that keeps a maze within `max_board_size`.
+
+    Parameters:
+        width (int): The width of the maze in cells.
+        height (int): The height of the maze in cells.
+        max_board_size (int): The largest width or height of the board in pixels.
+
+    Returns:
+        int: The cell size in pixels, at least 1.
+    """
+    return max(1, min(CELL_SIZE, max_board_size // max(width, height)))
+
+
+# Available renderers, selectable with the --renderer command line option
+RENDERERS = {"tk": TkRenderer, "pygame": PygameRenderer}
+
+
+def create_maze(width, height):
+    """
+    Generates a random maze using the Depth-First Search (DFS) algorithm.
+
+    This function initializes a maze grid where all cells are initially walls. It then
+    uses a stack-based approach to create a path through the maze. The path is created
+    by randomly selecting neighboring cells, marking them as part of the path, and
+    removing walls between cells. The maze is ensured to have an entrance and an exit.
+
+    The resulting maze is a 2D list where:
+    - `0` represents a path.
+    - `1` represents a wall.
+
+    Parameters:
+        width (int): The width of the maze in cells (must be odd).
+        height (int): The height of the maze in cells (must be odd).
+
+    Returns:
+        list[list[int]]: A 2D list representing the generated maze. Each cell in the maze
+        is either a `0` (path) or `1` (wall).
+
+    Algorithm:
+        1. Initialize the maze grid with walls (`1`).
+        2. Set the starting position at `(1, 1)` as a path (`0`).
+        3. Use a stack to keep track of the current path.
+        4. Shuffle possible directions to ensure randomness.
+        5. For each position:
+            - Check the unvisited neighboring cells.
+            - If there are unvisited neighbors, randomly select one, mark it as a path,
+              and remove the wall between the current cell and the neighbor.
+            - If no unvisited neighbors are available, backtrack by popping the stack.
+        6. Ensure there is an entrance at `(1, 0)` and an exit at `(height - 2, width - 1)`.
+        7. Return the generated maze.
+
+    Notes:
+        - The maze is guaranteed to have at least one path from the entrance to the exit.
+        - The `DIRS` variable holds the possible directions as steps of two cells
+          [(2, 0), (-2, 0), (0, 2), (0, -2)] representing right, left, down, and up, respectively.
+        - The maze does not depend on any GUI state, so it can be generated without a window.
+    """
+    maze = [
+        [1 for _ in range(width)] for _ in range(height)
+    ]  # Start with walls everywhere
+    stack = [(1, 1)]  # Stack to keep track of the current path
+    maze[1][1] = 0  # Starting point
+
+    while stack:
+        x, y = stack[-1]  # Get the current position
+
+        # Shuffle the directions to randomize the path
+        random.shuffle(DIRS)
+        # Get the list of unvisited neighbors
+        neighbors = [
+            (x + dx, y + dy)
+            for dx, dy in DIRS
+            if 0 < x + dx < width - 1
+            and 0 < y + dy < height - 1
+            and maze[y + dy][x + dx] == 1
+        ]
+
+        if neighbors:
+            nx, ny = random.choice(neighbors)  # Choose a random neighbor
+            stack.append((nx, ny))  # Add the neighbor to the stack
+            maze[ny][nx] = 0  # Mark the neighbor as a path
+            maze[ny - (ny - y) // 2][
+                nx - (nx - x) // 2
+            ] = 0  # Remove the wall between cells
+        else:
+            stack.pop()  # Backtrack if no unvisited neighbors
+
+    # Ensure there is a path from the start to the end
+    maze[1][0] = 0  # Entrance
+    maze[height - 2][width - 1] = 0  # Exit
+
+    return maze
+
+
+def heuristic(a, b):
+    """
+    Computes the heuristic (Manhattan distance) between two points `a` and `b`.
+
+    Parameters:
+        a (tuple): The first point as (x, y).
+        b (tuple): The second point as (x, y).
+
+    Returns:
+        int: The Manhattan distance between points `a` and `b`.
+
+    Example:
+        Calling `heuristic((1, 1), (4, 5))` returns 7, which is the Manhattan distance between the two points.
+    """
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class SearchTrace:
+    """
+    A compact record of a search, used to replay it without recomputing.
+
+    Solvers record every cell they expand and every cell they add to the frontier as flat
+    cell indices (`y * width + x`) in typed arrays. Every `checkpoint_interval` expansions, the
+    set of cells currently on the frontier is stored as a checkpoint, so the state of the search
+    at any step can be rebuilt from the nearest checkpoint by replaying at most
+    `checkpoint_interval` steps.
+
+    Attributes:
+        width (int): The width of the maze in cells.
+        height (int): The height of the maze in cells.
+        algorithm (str): The key of the algorithm in `ALGORITHMS` that produced the trace.
+        start (tuple[int, int]): The starting position as (x, y).
+        end (tuple[int, int]): The target position as (x, y).
+        checkpoint_interval (int): Number of expansions between frontier checkpoints.
+        expanded (array.array): Cell index expanded at each step, in order.
+        frontier (array.array): Cell indices added to the frontier, in order.
+        frontier_offsets (array.array): For each step, the number of frontier events recorded
+            before that step's expansion; a final entry holds the total once the trace is finished.
+        checkpoints (list[array.array]): Sorted frontier cell indices before steps
+            `0, checkpoint_interval, 2 * checkpoint_interval, ...`.
+        path (array.array): Cell indices of the path found from start to end (empty if none).
+        open_cells (set[int] | None): Cells currently on the frontier while recording.
+
+    Notes:
+        - A cell counts as on the frontier from the moment it is pushed until it is expanded,
+          however many times it was pushed in between.
+        - Step `k` means "after `k` expansions"; valid steps range from 0 to `len(trace)`.
+    """
+
+    CHECKPOINT_INTERVAL = 256
+
+    def __init__(self, width, height, algorithm, start, end, checkpoint_interval=None):
+        self.width = width
+        self.height = height
+        self.algorithm = algorithm
+        self.start = tuple(start)
+        self.end = tuple(end)
+        self.checkpoint_interval = checkpoint_interval or self.CHECKPOINT_INTERVAL
+        self.expanded = array("i")
+        self.frontier = array("i")
+        self.frontier_offsets = array("i")
+        self.checkpoints = []
+        self.path = array("i")
+        self.open_cells = set()
+
+    def __len__(self):
+        """
+        Returns the number of expansion steps in the trace.
+        """
+        return len(self.expanded)
+
+    def index(self, pos):
+        """
+        Converts an (x, y) position to a flat cell index.
+        """
+        return pos[1] * self.width + pos[0]
+
+    def cell(self, index):
+        """
+        Converts a flat cell index back to an (x, y) position.
+        """
+        return index % self.width, index // self.width
+
+    def push(self, pos):
+        """
+        Records that `pos` was added to the frontier.
+        """
+        index = pos[1] * self.width + pos[0]
+        self.frontier.append(index)
+        self.open_cells.add(index)
+
+    def expand(self, pos):
+        """
+        Records that `pos` was expanded, taking a frontier checkpoint when one is due.
+        """
+        index = pos[1] * self.width + pos[0]
+        if len(self.expanded) % self.checkpoint_interval == 0:
+            self.checkpoints.append(array("i", sorted(self.open_cells)))
+        self.frontier_offsets.append(len(self.frontier))
+        self.expanded.append(index)
+        self.open_cells.discard(index)
+
+    def finish(self, parents):
+        """
+        Completes the trace once the search stops.
+
+        Parameters:
+            parents (dict[tuple, tuple | None]): Maps each expanded position to the position it
+                was reached from (`None` for the start), used to rebuild the path to `end`.
+        """
+        self.frontier_offsets.append(len(self.frontier))
+        self.open_cells = None
+        if self.end in parents:
+            path = []
+            pos = self.end
+            while pos is not None:
+                path.append(self.index(pos))
+                pos = parents[pos]
+            path.reverse()
+            self.path = array("i", path)
+
+    def frontier_at(self, step):
+        """
+        Returns the set of cell indices on the frontier after `step` expansions.
+
+        The state is rebuilt from the nearest checkpoint at or before `step`, so the cost is
+        bounded by `checkpoint_interval` replayed steps plus the size of the frontier.
+        """
+        step = max(0, min(step, len(self.expanded)))
+        if not self.expanded:
+            return set(self.frontier)
+        checkpoint = min(step // self.checkpoint_interval, len(self.checkpoints) - 1)
+        frontier = set(self.checkpoints[checkpoint])
+        offsets = self.frontier_offsets
+        for i in range(checkpoint * self.checkpoint_interval, step):
+            frontier.discard(self.expanded[i])
+            frontier.update(self.frontier[offsets[i] : offsets[i + 1]])
+        return frontier
+
+    def to_dict(self):
+        """
+        Returns a JSON-serializable representation of the trace.
+
+        Arrays are stored as base64-encoded little-endian 32-bit integers.
+        """
+
+        def encode(values):
+            values = array("i", values)
+            if sys.byteorder != "little":
+                values.byteswap()
+            return base64.b64encode(values.tobytes()).decode("ascii")
+
+        return {
+            "width": self.width,
+            "height": self.height,
+            "algorithm": self.algorithm,
+            "start": list(self.start),
+            "end": list(self.end),
+            "checkpoint_interval": self.checkpoint_interval,
+            "expanded": encode(self.expanded),
+            "frontier": encode(self.frontier),
+            "frontier_offsets": encode(self.frontier_offsets),
+            "checkpoints": [encode(checkpoint) for checkpoint in self.checkpoints],
+            "path": encode(self.path),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds a trace from the output of `to_dict`.
+        """
+
+        def decode(text):
+            values = array("i")
+            values.frombytes(base64.b64decode(text))
+            if sys.byteorder != "little":
+                values.byteswap()
+            return values
+
+        trace = cls(
+            data["width"],
+            data["height"],
+            data["algorithm"],
+            data["start"],
+            data["end"],
+            data["checkpoint_interval"],
+        )
+        trace.expanded = decode(data["expanded"])
+        trace.frontier = decode(data["frontier"])
+        trace.frontier_offsets = decode(data["frontier_offsets"])
+        trace.checkpoints = [decode(checkpoint) for checkpoint in data["checkpoints"]]
+        trace.path = decode(data["path"])
+        trace.open_cells = None
+        return trace
+
+
+def neighbors(maze, pos):
+    """
+    Yields the open cells next to `pos`, in `MOVE_DIRS` order (right, left, down, up).
+    """
+    width, height = len(maze[0]), len(maze)
+    for dx, dy in MOVE_DIRS.values():
+        x, y = pos[0] + dx, pos[1] + dy
+        if 0 <= x < width and 0 <= y < height and maze[y][x] == 0:
+            yield (x, y)
+
+
+def solve_dfs(maze, start, end):
+    """
+    Runs Depth-First Search (DFS) from `start` to `end` and records it as a `SearchTrace`.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position in the maze as (x, y).
+        end (tuple): The target position (exit) in the maze as (x, y).
+
+    Returns:
+        SearchTrace: The recorded search, including the path found.
+
+    Notes:
+        - The search explores cells in the same order as the animated DFS in `MazeGame`.
+        - The search stops when the exit is expanded or all reachable cells are explored.
+    """
+    trace = SearchTrace(len(maze[0]), len(maze), "dfs", start, end)
+    stack = [(start, None)]  # (position, parent)
+    trace.push(start)
+    parents = {}
+
+    while stack:
+        current, parent = stack.pop()
+        if current in parents:
+            continue
+        parents[current] = parent
+        trace.expand(current)
+        if current == end:
+            break  # End the search if the exit is reached
+        for next_pos in neighbors(maze, current):
+            if next_pos not in parents:
+                stack.append((next_pos, current))
+                trace.push(next_pos)
+
+    trace.finish(parents)
+    return trace
+
+
+def solve_bfs(maze, start, end):
+    """
+    Runs Breadth-First Search (BFS) from `start` to `end` and records it as a `SearchTrace`.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position in the maze as (x, y).
+        end (tuple): The target position (exit) in the maze as (x, y).
+
+    Returns:
+        SearchTrace: The recorded search, including the shortest path found.
+    """
+    trace = SearchTrace(len(maze[0]), len(maze), "bfs", start, end)
+    queue = deque([(start, None)])  # (position, parent)
+    trace.push(start)
+    parents = {}
+
+    while queue:
+        current, parent = queue.popleft()
+        if current in parents:
+            continue
+        parents[current] = parent
+        trace.expand(current)
+        if current == end:
+            break  # End the search if the exit is reached
+        for next_pos in neighbors(maze, current):
+            if next_pos not in parents:
+                queue.append((next_pos, current))
+                trace.push(next_pos)
+
+    trace.finish(parents)
+    return trace
+
+
+def solve_dijkstra(maze, start, end):
+    """
+    Runs Dijkstra's Algorithm from `start` to `end` and records it as a `SearchTrace`.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position in the maze as (x, y).
+        end (tuple): The target position (exit) in the maze as (x, y).
+
+    Returns:
+        SearchTrace: The recorded search, including the shortest path found.
+    """
+    trace = SearchTrace(len(maze[0]), len(maze), "dijkstra", start, end)
+    heap = [(0, start, None)]  # (cost, position, parent)
+    trace.push(start)
+    parents = {}
+
+    while heap:
+        cost, current, parent = heapq.heappop(heap)
+        if current in parents:
+            continue
+        parents[current] = parent
+        trace.expand(current)
+        if current == end:
+            break  # End the search if the exit is reached
+        for next_pos in neighbors(maze, current):
+            if next_pos not in parents:
+                heapq.heappush(heap, (cost + 1, next_pos, current))
+                trace.push(next_pos)
+
+    trace.finish(parents)
+    return trace
+
+
+def solve_a_star(maze, start, end):
+    """
+    Runs the A* Algorithm from `start` to `end` and records it as a `SearchTrace`.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position in the maze as (x, y).
+        end (tuple): The target position (exit) in the maze as (x, y).
+
+    Returns:
+        SearchTrace: The recorded search, including the shortest path found.
+
+    Notes:
+        - The heuristic used is the Manhattan distance (see `heuristic`).
+    """
+    trace = SearchTrace(len(maze[0]), len(maze), "a_star", start, end)
+    open_set = [(heuristic(start, end), 0, start, None)]  # (f, cost, position, parent)
+    trace.push(start)
+    parents = {}
+
+    while open_set:
+        _, cost, current, parent = heapq.heappop(open_set)
+        if current in parents:
+            continue
+        parents[current] = parent
+        trace.expand(current)
+        if current == end:
+            break  # End the search if the exit is reached
+        for next_pos in neighbors(maze, current):
+            if next_pos not in parents:
+                heapq.heappush(
+                    open_set,
+                    (cost + 1 + heuristic(next_pos, end), cost + 1, next_pos, current),
+                )
+                trace.push(next_pos)
+
+    trace.finish(parents)
+    return trace
+
+
+class FirstVisitTrace:
+    """
+    Records a search made of several passes over the same cells into a `SearchTrace`.
+
+    HPA* searches some cells more than once for one query (connecting the start and goal, the
+    abstract A*, then refining each cluster). A `SearchTrace` expects every cell to be expanded
+    at most once and never pushed again afterwards, so this forwards `push` and `expand` only
+    for cells that have not been expanded yet. The trace then stays replayable and its length
+    counts distinct cells.
+
+    Attributes:
+        trace (SearchTrace): The trace being recorded.
+        expanded (set[tuple[int, int]]): Cells already expanded in the trace.
+    """
+
+    def __init__(self, trace):
+        self.trace = trace
+        self.expanded = set()
+
+    def push(self, pos):
+        """
+        Records that `pos` was added to the frontier, unless it was already expanded.
+        """
+        if pos not in self.expanded:
+            self.trace.push(pos)
+
+    def expand(self, pos):
+        """
+        Records that `pos` was expanded, the first time only.
+        """
+        if pos not in self.expanded:
+            self.expanded.add(pos)
+            self.trace.expand(pos)
+
+
+class HierarchicalPathfinder:
+    """
+    Hierarchical pathfinding (HPA*) over a maze partitioned into square clusters.
+
+    The maze is split into clusters of `cluster_size` x `cluster_size` cells. Wherever open cells
+    face each other across the border of two clusters, an entrance is created: the pair of cells
+    becomes two nodes of an abstract graph, joined by an edge of cost 1. Inside each cluster, the
+    entrance nodes are joined by edges whose cost is their shortest distance within the cluster.
+    This abstract graph is built once per maze.
+
+    A query connects the start and goal to the entrances of their clusters, runs A* on the small
+    abstract graph, and then refines each abstract edge into cells with a search limited to a
+    single cluster, so only the clusters along the route are searched cell by cell.
+
+    Attributes:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        width (int): The width of the maze in cells.
+        height (int): The height of the maze in cells.
+        cluster_size (int): The side of a cluster in cells.
+        columns (int): Number of clusters across the maze.
+        rows (int): Number of clusters down the maze.
+        graph (dict[tuple, dict[tuple, int]]): Abstract graph: node position -> {neighbor: cost}.
+        cluster_nodes (dict[tuple, set[tuple]]): Entrance nodes located in each cluster (cx, cy).
+        entrances (dict[tuple, list[tuple]]): Entrance cell pairs for each border. A border is
+            ("h", cx, cy) between clusters (cx, cy) and (cx + 1, cy), or ("v", cx, cy) between
+            (cx, cy) and (cx, cy + 1).
+
+    Notes:
+        - Paths are optimal within the abstraction; in a perfect maze (one path between any two
+          cells, as made by `create_maze`) they are always the shortest path.
+        - After changing walls inside a cluster, call `update_cluster` (or use `set_cell`) to
+          rebuild only that cluster and its neighbors.
+    """
+
+    CLUSTER_SIZE = 16
+    # Open border runs at least this wide get an entrance at each end
+    MAX_ENTRANCE_WIDTH = 6
+
+    def __init__(self, maze, cluster_size=CLUSTER_SIZE):
+        self.maze = maze
+        self.width = len(maze[0])
+        self.height = len(maze)
+        self.cluster_size = cluster_size
+        self.columns = -(-self.width // cluster_size)
+        self.rows = -(-self.height // cluster_size)
+        self.graph = {}
+        self.cluster_nodes = {}
+        self.entrances = {}
+        # Each border is shared by two clusters; add it once, from the cluster left of or above it
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                if cx + 1 < self.columns:
+                    self.add_border(("h", cx, cy))
+                if cy + 1 < self.rows:
+                    self.add_border(("v", cx, cy))
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                self.connect_cluster((cx, cy))
+
+    def cluster_of(self, pos):
+        """
+        Returns the (cx, cy) cluster containing the cell `pos`.
+        """
+        return pos[0] // self.cluster_size, pos[1] // self.cluster_size
+
+    def cluster_bounds(self, cluster):
+        """
+        Returns the cell range `(x0, y0, x1, y1)` of `cluster`, with `x1` and `y1` exclusive.
+        """
+        x0 = cluster[0] * self.cluster_size
+        y0 = cluster[1] * self.cluster_size
+        return (
+            x0,
+            y0,
+            min(x0 + self.cluster_size, self.width),
+            min(y0 + self.cluster_size, self.height),
+        )
+
+    def neighbor_clusters(self, cluster):
+        """
+        Returns the clusters left of, above, right of and below `cluster` that exist.
+        """
+        cx, cy = cluster
+        return [
+            (nx, ny)
+            for nx, ny in ((cx - 1, cy), (cx, cy - 1), (cx + 1, cy), (cx, cy + 1))
+            if 0 <= nx < self.columns and 0 <= ny < self.rows
+        ]
+
+    def border_between(self, a, b):
+        """
+        Returns the border key between two neighboring clusters `a` and `b`.
+        """
+        first = min(a, b)
+        return ("h" if a[1] == b[1] else "v",) + first
+
+    def add_border(self, border):
+        """
+        Finds the entrances across `border` and adds them to the abstract graph.
+
+        Process:
+            1. Walk along the border, pairing each cell with the cell facing it in the next cluster.
+            2. Group consecutive pairs where both cells are open into runs.
+            3. Create one entrance in the middle of each run, or one at each end of runs at least
+               `MAX_ENTRANCE_WIDTH` wide.
+            4. Join the two cells of each entrance with an edge of cost 1.
+        """
+        kind, cx, cy = border
+        size = self.cluster_size
+        if kind == "h":
+            x = (cx + 1) * size - 1
+            pairs = [
+                ((x, y), (x + 1, y))
+                for y in range(cy * size, min((cy + 1) * size, self.height))
+            ]
+        else:
+            y = (cy + 1) * size - 1
+            pairs = [
+                ((x, y), (x, y + 1))
+                for x in range(cx * size, min((cx + 1) * size, self.width))
+            ]
+        maze = self.maze
+        entrances = []
+        run = []
+        for a, b in pairs + [(None, None)]:  # The sentinel closes the last run
+            if a is not None and maze[a[1]][a[0]] == 0 and maze[b[1]][b[0]] == 0:
+                run.append((a, b))
+                continue
+            if len(run) >= self.MAX_ENTRANCE_WIDTH:
+                entrances += [run[0], run[-1]]
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        self.entrances[border] = entrances
+        for a, b in entrances:
+            self.add_edge(a, b, 1)
+
+    def add_edge(self, a, b, cost):
+        """
+        Adds an undirected edge between nodes `a` and `b` of the abstract graph.
+        """
+        self.graph.setdefault(a, {})[b] = cost
+        self.graph.setdefault(b, {})[a] = cost
+        self.cluster_nodes.setdefault(self.cluster_of(a), set()).add(a)
+        self.cluster_nodes.setdefault(self.cluster_of(b), set()).add(b)
+
+    def cluster_distances(self, source, cluster, targets, trace=None):
+        """
+        Returns the distances from `source` to each reachable cell of `targets`, moving only within `cluster`.
+
+        The breadth-first search stops as soon as every target has been found. If `trace` is
+        given, the cells it pushes and expands are recorded in it.
+        """
+        x0, y0, x1, y1 = self.cluster_bounds(cluster)
+        maze = self.maze
+        remaining = set(targets)
+        remaining.discard(source)
+        found = {}
+        distances = {source: 0}
+        queue = deque([source])
+        if trace is not None:
+            trace.push(source)
+        while queue and remaining:
+            current = queue.popleft()
+            if trace is not None:
+                trace.expand(current)
+            distance = distances[current] + 1
+            for dx, dy in MOVE_DIRS.values():
+                x, y = current[0] + dx, current[1] + dy
+                if x0 <= x < x1 and y0 <= y < y1 and maze[y][x] == 0:
+                    next_pos = (x, y)
+                    if next_pos not in distances:
+                        distances[next_pos] = distance
+                        queue.append(next_pos)
+                        if trace is not None:
+                            trace.push(next_pos)
+                        if next_pos in remaining:
+                            found[next_pos] = distance
+                            remaining.discard(next_pos)
+        return found
+
+    def cluster_path(self, start, goal, cluster, trace=None):
+        """
+        Returns the shortest path from `start` to `goal` moving only within `cluster`, or None.
+
+        If `trace` is given, the cells the search pushes and expands are recorded in it.
+        """
+        x0, y0, x1, y1 = self.cluster_bounds(cluster)
+        maze = self.maze
+        parents = {start: None}
+        queue = deque([start])
+        if trace is not None:
+            trace.push(start)
+        while queue:
+            current = queue.popleft()
+            if trace is not None:
+                trace.expand(current)
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parents[current]
+                return path[::-1]
+            for dx, dy in MOVE_DIRS.values():
+                x, y = current[0] + dx, current[1] + dy
+                if x0 <= x < x1 and y0 <= y < y1 and maze[y][x] == 0:
+                    if (x, y) not in parents:
+                        parents[(x, y)] = current
+                        queue.append((x, y))
+                        if trace is not None:
+                            trace.push((x, y))
+        return None
+
+    def connect_cluster(self, cluster):
+        """
+        Adds an edge between every pair of entrance nodes of `cluster` that are connected inside it.
+        """
+        nodes = sorted(self.cluster_nodes.get(cluster, ()))
+        for i, node in enumerate(nodes):
+            # Edges are undirected, so each search only needs the nodes after this one
+            for other, distance in self.cluster_distances(
+                node, cluster, nodes[i + 1 :]
+            ).items():
+                self.add_edge(node, other, distance)
+
+    def update_cluster(self, cx, cy):
+        """
+        Rebuilds the abstract graph around cluster (cx, cy) after its cells changed.
+
+        Process:
+            1. Remove the entrances on the cluster's borders.
+            2. Remove the intra-cluster edges of the cluster and its neighbors, and any node that
+               no longer belongs to an entrance.
+            3. Find the entrances on the cluster's borders again.
+            4. Reconnect the entrance nodes inside the cluster and its neighbors.
+
+        Notes:
+            - Only the changed cluster and its (up to four) neighbors are searched; the rest of
+              the abstract graph is untouched.
+        """
+        cluster = (cx, cy)
+        neighbors = self.neighbor_clusters(cluster)
+        borders = [self.border_between(cluster, other) for other in neighbors]
+        for border in borders:
+            for a, b in self.entrances.pop(border, ()):
+                self.graph[a].pop(b, None)
+                self.graph[b].pop(a, None)
+        for affected in [cluster] + neighbors:
+            nodes = self.cluster_nodes.get(affected, set())
+            for node in list(nodes):
+                edges = self.graph[node]
+                for other in [o for o in edges if self.cluster_of(o) == affected]:
+                    del edges[other]
+                if not edges:  # Only inter-cluster edges remain; none means no entrance
+                    del self.graph[node]
+                    nodes.discard(node)
+        for border in borders:
+            self.add_border(border)
+        for affected in [cluster] + neighbors:
+            self.connect_cluster(affected)
+
+    def set_cell(self, x, y, value):
+        """
+        Sets the maze cell at `(x, y)` to `value` (0 for path, 1 for wall) and updates the graph locally.
+        """
+        self.maze[y][x] = value
+        self.update_cluster(*self.cluster_of((x, y)))
+
+    def abstract_search(self, start, goal, trace=None):
+        """
+        Runs A* on the abstract graph from node `start` to node `goal`.
+
+        Parameters:
+            start (tuple): The start node as (x, y); must be in `graph`.
+            goal (tuple): The goal node as (x, y); must be in `graph`.
+            trace (SearchTrace | None): If given, abstract nodes pushed and expanded are recorded in it.
+
+        Returns:
+            list[tuple] | None: The abstract nodes from start to goal, or None if unreachable.
+        """
+        open_set = [(heuristic(start, goal), 0, start, None)]  # (f, cost, node, parent)
+        parents = {}
+        if trace is not None:
+            trace.push(start)
+        while open_set:
+            _, cost, current, parent = heapq.heappop(open_set)
+            if current in parents:
+                continue
+            parents[current] = parent
+            if trace is not None:
+                trace.expand(current)
+            if current == goal:
+                break
+            for next_node, step in self.graph[current].items():
+                if next_node not in parents:
+                    heapq.heappush(
+                        open_set,
+                        (
+                            cost + step + heuristic(next_node, goal),
+                            cost + step,
+                            next_node,
+                            current,
+                        ),
+                    )
+                    if trace is not None:
+                        trace.push(next_node)
+        if goal not in parents:
+            return None
+        nodes = []
+        current = goal
+        while current is not None:
+            nodes.append(current)
+            current = parents[current]
+        return nodes[::-1]
+
+    def find_path(self, start, goal, trace=None):
+        """
+        Finds a path from `start` to `goal` through the abstract graph.
+
+        Parameters:
+            start (tuple): The starting position in the maze as (x, y).
+            goal (tuple): The target position in the maze as (x, y).
+            trace (SearchTrace | None): If given, the whole search is recorded in it: the cells
+                searched to connect the start and goal to their entrances, the abstract nodes,
+                and the cells searched while refining the path, each cell once (see
+                `FirstVisitTrace`).
+
+        Returns:
+            list[tuple] | None: The cells of the path from start to goal, or None if there is none.
+
+        Process:
+            1. If both cells share a cluster, try a search within that cluster first.
+            2. Temporarily connect the start and goal to the entrances of their clusters.
+            3. Run A* on the abstract graph, then remove the temporary nodes again.
+            4. Refine each abstract edge inside a cluster into cells with a search limited to
+               that cluster; edges between clusters are single steps.
+        """
+        start, goal = tuple(start), tuple(goal)
+        if trace is not None:
+            trace = FirstVisitTrace(trace)
+        if self.maze[start[1]][start[0]] != 0 or self.maze[goal[1]][goal[0]] != 0:
+            return None
+        start_cluster = self.cluster_of(start)
+        goal_cluster = self.cluster_of(goal)
+        if start_cluster == goal_cluster:
+            path = self.cluster_path(start, goal, start_cluster, trace)
+            if path is not None:
+                return path
+        added = []
+        for point, cluster in ((start, start_cluster), (goal, goal_cluster)):
+            if point in self.graph:
+                continue  # Already an entrance node
+            distances = self.cluster_distances(
+                point, cluster, self.cluster_nodes.get(cluster, ()), trace
+            )
+            self.graph[point] = distances
+            for node, distance in distances.items():
+                self.graph[node][point] = distance
+            added.append(point)
+        try:
+            nodes = self.abstract_search(start, goal, trace)
+        finally:
+            for point in added:
+                for node in self.graph.pop(point):
+                    self.graph[node].pop(point, None)
+        if nodes is None:
+            return None
+        path = [start]
+        for a, b in zip(nodes, nodes[1:]):
+            cluster = self.cluster_of(a)
+            if cluster != self.cluster_of(b):
+                path.append(b)  # Entrance edge between neighboring cells
+            else:
+                path.extend(self.cluster_path(a, b, cluster, trace)[1:])
+        return path
+
+
+# Abstract graphs reused across queries, keyed by (maze hash, cluster size), least recently used first
+PATHFINDERS = OrderedDict()
+PATHFINDERS_SIZE = 4
+
+
+def hierarchical_pathfinder(maze, cluster_size=HierarchicalPathfinder.CLUSTER_SIZE):
+    """
+    Returns the `HierarchicalPathfinder` for `maze`, building it only the first time.
+
+    Pathfinders are kept in `PATHFINDERS` by maze content, so the abstract graph is precomputed
+    once per maze and cluster size; at most `PATHFINDERS_SIZE` are kept.
+
+    Notes:
+        - To edit a maze while keeping its abstract graph up to date, create a
+          `HierarchicalPathfinder` directly and use its `set_cell` method.
+    """
+    key = (maze_hash(maze), cluster_size)
+    pathfinder = PATHFINDERS.get(key)
+    if pathfinder is None:
+        pathfinder = HierarchicalPathfinder(maze, cluster_size)
+        PATHFINDERS[key] = pathfinder
+        while len(PATHFINDERS) > PATHFINDERS_SIZE:
+            PATHFINDERS.popitem(last=False)
+    PATHFINDERS.move_to_end(key)
+    return pathfinder
+
+
+def solve_hpa(
+    maze, start, end, cluster_size=HierarchicalPathfinder.CLUSTER_SIZE, pathfinder=None
+):
+    """
+    Runs hierarchical pathfinding (HPA*) from `start` to `end` and records it as a `SearchTrace`.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position in the maze as (x, y).
+        end (tuple): The target position (exit) in the maze as (x, y).
+        cluster_size (int): The side of a cluster in cells.
+        pathfinder (HierarchicalPathfinder | None): A pathfinder already built for `maze`, which
+            skips looking it up by content hash (default: `hierarchical_pathfinder(maze)`).
+
+    Returns:
+        SearchTrace: The recorded search, including the path found.
+
+    Notes:
+        - The trace records every distinct cell searched for this query: connecting the start
+          and end to their cluster entrances, the entrance nodes expanded by A* on the abstract
+          graph, and refining the route cluster by cluster. Its length is therefore comparable
+          with the other solvers' in a race. Building the abstract graph is not included.
+        - The abstract graph is built on the first query for a maze (see `hierarchical_pathfinder`).
+    """
+    trace = SearchTrace(len(maze[0]), len(maze), "hpa", start, end)
+    pathfinder = pathfinder or hierarchical_pathfinder(maze, cluster_size)
+    path = pathfinder.find_path(start, end, trace)
+    trace.finish({})
+    if path is not None:
+        trace.path = array("i", (trace.index(pos) for pos in path))
+    return trace
+
+
+# Registered pathfinding algorithms: key -> (button label, solver, color used to paint expanded cells)
+Algorithm = namedtuple("Algorithm", ["label", "solve", "color"])
+ALGORITHMS = {
+    "dfs": Algorithm("DFS", solve_dfs, "yellow"),
+    "bfs": Algorithm("BFS", solve_bfs, "light blue"),
+    "dijkstra": Algorithm("Dijkstra", solve_dijkstra, "orange"),
+    "a_star": Algorithm("A* Algorithm", solve_a_star, "purple"),
+    "hpa": Algorithm("HPA*", solve_hpa, "magenta"),
+}
+
+
+def save_traces(filename, maze, traces):
+    """
+    Saves a maze together with search traces recorded on it as a JSON file.
+
+    Parameters:
+        filename (str): The file to write.
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        traces (Iterable[SearchTrace]): The traces to store with the maze.
+    """
+    data = {
+        "maze": ["".join(str(cell) for cell in row) for row in maze],
+        "traces": [trace.to_dict() for trace in traces],
+    }
+    with open(filename, "w") as f:
+        json.dump(data, f)
+
+
+def load_traces(filename):
+    """
+    Loads a maze and its search traces saved with `save_traces`.
+
+    Returns:
+        tuple[list[list[int]], list[SearchTrace]]: The maze grid and the stored traces.
+    """
+    with open(filename) as f:
+        data = json.load(f)
+    maze = [[int(cell) for cell in row] for row in data["maze"]]
+    return maze, [SearchTrace.from_dict(trace) for trace in data["traces"]]
+
+
+# Result of one algorithm in a race; `trace` is None when traces were not requested
+RaceResult = namedtuple(
+    "RaceResult", ["algorithm", "expanded", "path_length", "seconds", "trace"]
+)
+
+
+def race_worker(algorithm, maze, start, end, keep_trace):
+    """
+    Solves `maze` with one algorithm and times it; runs inside a worker process of `submit_race`.
+
+    Returns:
+        RaceResult: The statistics of the search, with its trace if `keep_trace` is true.
+
+    Notes:
+        - The HPA* abstract graph is built before the timer starts, since a worker reused from
+          an earlier race already has it cached; every race then times the query alone.
+    """
+    if algorithm == "hpa":
+        hierarchical_pathfinder(maze)
+    began = time.perf_counter()
+    trace = ALGORITHMS[algorithm].solve(maze, start, end)
+    seconds = time.perf_counter() - began
+    return RaceResult(
+        algorithm, len(trace), len(trace.path), seconds, trace if keep_trace else None
+    )
+
+
+def submit_race(pool, maze, start, end, algorithms=None, keep_traces=True):
+    """
+    Starts solving the same maze with several algorithms concurrently in a process pool.
+
+    Parameters:
+        pool (concurrent.futures.ProcessPoolExecutor): The pool that runs the searches.
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position in the maze as (x, y).
+        end (tuple): The target position (exit) in the maze as (x, y).
+        algorithms (Iterable[str] | None): Keys of `ALGORITHMS` to run (default: all of them).
+        keep_traces (bool): Whether to send each search trace back with its statistics.
+
+    Returns:
+        list[concurrent.futures.Future]: One future per algorithm, each resolving to a `RaceResult`.
+
+    Notes:
+        - This returns immediately, which lets the GUI poll the futures instead of blocking.
+    """
+    return [
+        pool.submit(race_worker, algorithm, maze, start, end, keep_traces)
+        for algorithm in algorithms or ALGORITHMS
+    ]
+
+
+def rank_results(results):
+    """
+    Sorts race results by number of expanded cells, then by wall time.
+    """
+    return sorted(results, key=lambda result: (result.expanded, result.seconds))
+
+
+def race(maze, start, end, algorithms=None, processes=None, keep_traces=True):
+    """
+    Solves the same maze with several algorithms in parallel and ranks the results.
+
+    A full comparison takes about as long as the slowest algorithm rather than the sum of all
+    of them, since each algorithm runs in its own worker process.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position in the maze as (x, y).
+        end (tuple): The target position (exit) in the maze as (x, y).
+        algorithms (Iterable[str] | None): Keys of `ALGORITHMS` to run (default: all of them).
+        processes (int | None): Number of worker processes (default: one per algorithm, up to
+            the number of CPUs).
+        keep_traces (bool): Whether to return each search trace with its statistics.
+
+    Returns:
+        list[RaceResult]: The results, ranked with `rank_results`.
+
+    Example:
+        Calling `race(maze, (1, 1), (30, 29))` on a 31x31 maze returns every algorithm in
+        `ALGORITHMS` ranked from fewest to most expanded cells.
+    """
+    algorithms = list(algorithms or ALGORITHMS)
+    processes = processes or min(len(algorithms), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = submit_race(pool, maze, start, end, algorithms, keep_traces)
+        return rank_results(future.result() for future in futures)
+
+
+def format_race(results):
+    """
+    Formats ranked race results as a plain-text table.
+
+    Returns:
+        str: One header line and one line per algorithm, aligned in columns.
+    """
+    rows = [("#", "Algorithm", "Expanded", "Path", "Time (ms)")]
+    for rank, result in enumerate(results, 1):
+        rows.append(
+            (
+                str(rank),
+                ALGORITHMS[result.algorithm].label,
+                str(result.expanded),
+                str(result.path_length),
+                f"{result.seconds * 1000:.1f}",
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if i == 1 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+
+
+def maze_hash(maze):
+    """
+    Returns a content hash of `maze` that identifies it in a `SolveCache`.
+
+    Two mazes with the same dimensions and the same walls always have the same hash, however
+    they were created or loaded.
+
+    Returns:
+        str: A 32-character hexadecimal BLAKE2b digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{len(maze[0])}x{len(maze)}:".encode("ascii"))
+    for row in maze:
+        digest.update(bytes(row))
+    return digest.hexdigest()
+
+
+class SolveCache:
+    """
+    A bounded LRU cache of search results, keyed by maze content.
+
+    Keys are `(maze hash, start, end, algorithm, parameters)`, so repeating a query on the same
+    maze returns the stored `SearchTrace` immediately, even for a maze that was loaded from a file
+    or regenerated with the same seed. When the cache holds `maxsize` entries, the least recently
+    used one is evicted. If a `filename` is given, the entries are loaded from it on creation and
+    written back by `save`.
+
+    Attributes:
+        maxsize (int): Maximum number of cached results.
+        filename (str | None): File used to persist the cache, if any.
+        entries (OrderedDict[tuple, SearchTrace]): Cached results, least recently used first.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to run a search.
+        evictions (int): Number of entries dropped to respect `maxsize`.
+
+    Notes:
+        - Each entry holds a full trace, so `maxsize` bounds memory use by the size of the
+          largest mazes solved times `maxsize`.
+        - The cache file is a pickle; only load cache files you wrote yourself.
+    """
+
+    MAXSIZE = 128
+
+    def __init__(self, maxsize=MAXSIZE, filename=None):
+        self.maxsize = maxsize
+        self.filename = filename
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if filename is not None and os.path.exists(filename):
+            with open(filename, "rb") as f:
+                self.entries = pickle.load(f)
+            self.trim()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def key(self, maze, start, end, algorithm, params=None, maze_key=None):
+        """
+        Builds the cache key for a query.
+
+        Parameters:
+            maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+            start (tuple): The starting position in the maze as (x, y).
+            end (tuple): The target position (exit) in the maze as (x, y).
+            algorithm (str): The key of the algorithm in `ALGORITHMS`.
+            params (dict | None): Extra keyword arguments passed to the solver.
+            maze_key (str | None): The precomputed `maze_hash(maze)`, to avoid rehashing a large maze.
+        """
+        return (
+            maze_key or maze_hash(maze),
+            tuple(start),
+            tuple(end),
+            algorithm,
+            tuple(sorted((params or {}).items())),
+        )
+
+    def get(self, key):
+        """
+        Returns the cached result for `key` (marking it as recently used), or None.
+        """
+        trace = self.entries.get(key)
+        if trace is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return trace
+
+    def put(self, key, trace):
+        """
+        Stores `trace` under `key`, evicting the least recently used entries if needed.
+        """
+        self.entries[key] = trace
+        self.entries.move_to_end(key)
+        self.trim()
+
+    def trim(self):
+        """
+        Evicts least recently used entries until at most `maxsize` remain.
+        """
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def solve(self, maze, start, end, algorithm, maze_key=None, **params):
+        """
+        Returns the trace of `algorithm` from `start` to `end`, searching only on a cache miss.
+
+        Parameters:
+            maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+            start (tuple): The starting position in the maze as (x, y).
+            end (tuple): The target position (exit) in the maze as (x, y).
+            algorithm (str): The key of the algorithm in `ALGORITHMS`.
+            maze_key (str | None): The precomputed `maze_hash(maze)`, if available.
+            **params: Extra keyword arguments passed to the solver; they are part of the key.
+
+        Returns:
+            SearchTrace: The cached or newly recorded trace.
+        """
+        key = self.key(maze, start, end, algorithm, params, maze_key)
+        trace = self.get(key)
+        if trace is None:
+            trace = ALGORITHMS[algorithm].solve(maze, start, end, **params)
+            self.put(key, trace)
+        return trace
+
+    def stats(self):
+        """
+        Returns the cache statistics.
+
+        Returns:
+            dict: `hits`, `misses`, `evictions`, `size`, `maxsize` and `hit_rate` (0.0 to 1.0).
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """
+        Removes every entry (statistics are kept).
+        """
+        self.entries.clear()
+
+    def save(self):
+        """
+        Writes the entries to `filename`, if one was given.
+
+        The file is written to a temporary name first and then renamed, so an interrupted save
+        never leaves a truncated cache behind.
+        """
+        if self.filename is None:
+            return
+        temporary = self.filename + ".tmp"
+        with open(temporary, "wb") as f:
+            pickle.dump(self.entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.filename)
+
+
+# Cache shared by the GUI, the command line and the batch API unless another one is passed in
+SOLVE_CACHE = SolveCache()
+
+
+def solve(maze, start, end, algorithm="a_star", cache=SOLVE_CACHE, **params):
+    """
+    Solves a single query through `cache`.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position in the maze as (x, y).
+        end (tuple): The target position (exit) in the maze as (x, y).
+        algorithm (str): The key of the algorithm in `ALGORITHMS` (default: "a_star").
+        cache (SolveCache): The cache to use (default: `SOLVE_CACHE`).
+        **params: Extra keyword arguments passed to the solver.
+
+    Returns:
+        SearchTrace: The trace of the search, including the path found.
+    """
+    return cache.solve(maze, start, end, algorithm, **params)
+
+
+def solve_batch(maze, queries, algorithm="a_star", cache=SOLVE_CACHE, **params):
+    """
+    Solves many start/end queries on one maze through `cache`.
+
+    The maze is hashed once for the whole batch, and repeated queries are answered from the cache.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        queries (Iterable[tuple[tuple, tuple]]): (start, end) pairs as (x, y) positions.
+        algorithm (str): The key of the algorithm in `ALGORITHMS` (default: "a_star").
+        cache (SolveCache): The cache to use (default: `SOLVE_CACHE`).
+        **params: Extra keyword arguments passed to the solver.
+
+    Returns:
+        list[SearchTrace]: One trace per query, in order.
+    """
+    maze_key = maze_hash(maze)
+    return [
+        cache.solve(maze, start, end, algorithm, maze_key=maze_key, **params)
+        for start, end in queries
+    ]
+
+
+class SharedMaze:
+    """
+    A maze grid stored once in shared memory, so that several processes can read it without copies.
+
+    The grid is kept as one byte per cell (0 for open path, 1 for wall), row after row, in a
+    `multiprocessing.shared_memory.SharedMemory` block. Indexing returns a memoryview of the row,
+    so `maze[y][x]`, `len(maze)` and `len(maze[0])` work as with the usual nested lists and every
+    solver in `ALGORITHMS` accepts a `SharedMaze` unchanged.
+
+    Attributes:
+        width (int): The width of the maze in cells.
+        height (int): The height of the maze in cells.
+        memory (SharedMemory): The shared memory block holding the grid.
+        owner (bool): Whether this process created the block and must unlink it.
+        rows (list[memoryview]): One writable view per row of the grid.
+    """
+
+    def __init__(self, memory, width, height, owner):
+        """
+        Wraps a shared memory block; use `create` or `attach` instead of calling this directly.
+        """
+        self.memory = memory
+        self.width = width
+        self.height = height
+        self.owner = owner
+        self.buffer = memory.buf[: width * height]
+        self.rows = [self.buffer[y * width : (y + 1) * width] for y in range(height)]
+
+    @classmethod
+    def create(cls, maze):
+        """
+        Copies a maze into a new shared memory block.
+
+        Parameters:
+            maze (Sequence[Sequence[int]]): The maze grid (0 for open path, 1 for wall).
+
+        Returns:
+            SharedMaze: The shared copy; the caller must `unlink` it when done (or use `with`).
+        """
+        width, height = len(maze[0]), len(maze)
+        memory = SharedMemory(create=True, size=width * height)
+        shared = cls(memory, width, height, owner=True)
+        for y, row in enumerate(maze):
+            shared.rows[y][:] = bytes(row)
+        return shared
+
+    @classmethod
+    def attach(cls, name, width, height):
+        """
+        Opens a maze created by `create` in another process, by the name of its memory block.
+        """
+        return cls(SharedMemory(name=name), width, height, owner=False)
+
+    @property
+    def name(self):
+        """
+        The name of the shared memory block, for `attach`.
+        """
+        return self.memory.name
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, y):
+        return self.rows[y]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        """
+        Releases the views of the grid and detaches this process from the memory block.
+        """
+        for row in self.rows:
+            row.release()
+        self.rows = []
+        self.buffer.release()
+        self.memory.close()
+
+    def unlink(self):
+        """
+        Frees the memory block once every process has closed it; only the owner calls this.
+        """
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+
+# Results of one batch of queries solved by `solve_queries_parallel`: the position of its first
+# query, then per query the number of path cells (0 if the end is unreachable) and of expanded
+# cells, and the paths of all the queries as flat cell indices (`y * width + x`), one after another
+QueryBatch = namedtuple("QueryBatch", ["first", "lengths", "expanded", "paths"])
+
+# State of a worker process of `solve_queries_parallel`, set once by `attach_query_worker`
+QUERY_WORKER = None
+
+
+def attach_query_worker(name, width, height, algorithm, keep_paths, params):
+    """
+    Attaches a worker process to the shared maze and prepares its solver; runs once per worker.
+    """
+    global QUERY_WORKER
+    maze = SharedMaze.attach(name, width, height)
+    params = dict(params)
+    if algorithm == "hpa":
+        # Build the abstract graph once per worker, rather than hashing the whole maze on every
+        # query; unlike the grid, this graph is not shared (see `solve_queries_parallel`)
+        params["pathfinder"] = HierarchicalPathfinder(
+            maze, params.get("cluster_size", HierarchicalPathfinder.CLUSTER_SIZE)
+        )
+    QUERY_WORKER = SimpleNamespace(
+        maze=maze,
+        solve=ALGORITHMS[algorithm].solve,
+        keep_paths=keep_paths,
+        params=params,
+    )
+
+
+def solve_query_batch(first, queries):
+    """
+    Solves a batch of queries on the shared maze of this worker process.
+
+    Parameters:
+        first (int): The position of the first query of the batch among all queries.
+        queries (array.array): The queries as flat `start x, start y, end x, end y` quadruples.
+
+    Returns:
+        QueryBatch: The results of the batch, in query order.
+    """
+    worker = QUERY_WORKER
+    lengths = array("i")
+    expanded = array("i")
+    paths = array("i")
+    for i in range(0, len(queries), 4):
+        trace = worker.solve(
+            worker.maze,
+            (queries[i], queries[i + 1]),
+            (queries[i + 2], queries[i + 3]),
+            **worker.params,
+        )
+        lengths.append(len(trace.path))
+        expanded.append(len(trace))
+        if worker.keep_paths:
+            paths += trace.path
+    return QueryBatch(first, lengths, expanded, paths)
+
+
+def solve_queries_parallel(
+    maze,
+    queries,
+    algorithm="a_star",
+    processes=None,
+    batch_size=256,
+    keep_paths=True,
+    **params,
+):
+    """
+    Solves many start/end queries on one maze with a pool of worker processes sharing the grid.
+
+    The maze is placed in shared memory once, and each worker attaches to it when it starts, so
+    only the small query and result arrays travel between processes. Batches are solved in
+    parallel and yielded as soon as they are ready, in query order.
+
+    Parameters:
+        maze (list[list[int]] | SharedMaze): The maze grid (0 for open path, 1 for wall). A
+            `SharedMaze` is used as it is, which avoids copying a maze that is already shared.
+        queries (Iterable[tuple[tuple, tuple]]): (start, end) pairs as (x, y) positions.
+        algorithm (str): The key of the algorithm in `ALGORITHMS` (default: "a_star").
+        processes (int | None): Number of worker processes (default: the number of CPUs).
+        batch_size (int): Number of queries sent to a worker at a time.
+        keep_paths (bool): Whether to send the paths back, or only their lengths.
+        **params: Extra keyword arguments passed to the solver.
+
+    Yields:
+        QueryBatch: The results of each batch of up to `batch_size` queries.
+
+    Notes:
+        - At most two batches per worker are in flight, so the queries can be a lazy iterable
+          much larger than memory.
+        - Results do not go through a `SolveCache`; use `solve_batch` to reuse earlier results.
+        - "hpa" is the exception to sharing a single copy: every worker builds its own
+          `HierarchicalPathfinder`, a graph of Python dicts and sets that grows with the maze,
+          so it costs memory and build time once per process. Prefer the flat algorithms when
+          memory is tight, or use fewer processes.
+    """
+    processes = processes or os.cpu_count() or 1
+    shared = maze if isinstance(maze, SharedMaze) else SharedMaze.create(maze)
+    pool = ProcessPoolExecutor(
+        processes,
+        initializer=attach_query_worker,
+        initargs=(
+            shared.name,
+            shared.width,
+            shared.height,
+            algorithm,
+            keep_paths,
+            params,
+        ),
+    )
+    pending = deque()
+    queries = iter(queries)
+    try:
+        first = 0
+        while True:
+            batch = array(
+                "i",
+                (
+                    value
+                    for start, end in itertools.islice(queries, batch_size)
+                    for value in (*start, *end)
+                ),
+            )
+            if not batch:
+                break
+            pending.append(pool.submit(solve_query_batch, first, batch))
+            first += len(batch) // 4
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+        if shared is not maze:
+            shared.close()
+            shared.unlink()
+
+
+def bfs_tree(maze, source):
+    """
+    Runs a full Breadth-First Search (BFS) from `source` over flat cell indices.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        source (tuple): The position to search from as (x, y).
+
+    Returns:
+        tuple[array.array, array.array]: For every cell index (`y * width + x`), the distance from
+        `source` (-1 if unreachable) and the index of the next cell on a shortest path back to
+        `source` (-1 for `source` itself and unreachable cells).
+    """
+    width, height = len(maze[0]), len(maze)
+    cells = b"".join(bytes(row) for row in maze)
+    distances = array("i", [-1]) * (width * height)
+    parents = array("i", [-1]) * (width * height)
+    start = source[1] * width + source[0]
+    distances[start] = 0
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        distance = distances[current] + 1
+        x = current % width
+        for next_index, inside in (
+            (current + 1, x + 1 < width),
+            (current - 1, x > 0),
+            (current + width, current + width < len(cells)),
+            (current - width, current >= width),
+        ):
+            if inside and cells[next_index] == 0 and distances[next_index] < 0:
+                distances[next_index] = distance
+                parents[next_index] = current
+                queue.append(next_index)
+    return distances, parents
+
+
+class DistanceMatrix:
+    """
+    Shortest distances between a fixed set of target cells in one maze.
+
+    One BFS is run from each target, so the distance from any other cell to every target (for
+    example from the player's current position) can then be read in O(1) per target, and the
+    shortest path to a target can be rebuilt by following the BFS tree rooted at it.
+
+    Attributes:
+        width (int): The width of the maze in cells.
+        targets (list[tuple[int, int]]): The target positions as (x, y).
+        trees (list[tuple[array.array, array.array]]): The `bfs_tree` of each target.
+        distances (list[list[int]]): `distances[i][j]` is the distance between targets `i` and `j`
+            (-1 if they are not connected).
+    """
+
+    def __init__(self, maze, targets):
+        self.width = len(maze[0])
+        self.targets = [tuple(target) for target in targets]
+        self.trees = [bfs_tree(maze, target) for target in self.targets]
+        self.distances = [
+            [tree[0][self.index(target)] for tree in self.trees]
+            for target in self.targets
+        ]
+
+    def index(self, pos):
+        """
+        Converts an (x, y) position to a flat cell index.
+        """
+        return pos[1] * self.width + pos[0]
+
+    def distances_from(self, pos):
+        """
+        Returns the distance from `pos` to each target (-1 if not connected).
+        """
+        index = self.index(pos)
+        return [distances[index] for distances, _ in self.trees]
+
+    def path(self, pos, target):
+        """
+        Returns the shortest path of cells from `pos` to the target with index `target`.
+        """
+        parents = self.trees[target][1]
+        index = self.index(pos)
+        path = [tuple(pos)]
+        while parents[index] >= 0:
+            index = parents[index]
+            path.append((index % self.width, index // self.width))
+        return path
+
+
+# Distance matrices reused across plans, keyed by (maze hash, targets), least recently used first
+DISTANCE_MATRICES = OrderedDict()
+DISTANCE_MATRICES_SIZE = 8
+
+
+def distance_matrix(maze, targets, maze_key=None):
+    """
+    Returns the `DistanceMatrix` for `targets` in `maze`, computing it only the first time.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        targets (Iterable[tuple]): The target positions as (x, y).
+        maze_key (str | None): The precomputed `maze_hash(maze)`, if available.
+    """
+    targets = tuple(tuple(target) for target in targets)
+    key = (maze_key or maze_hash(maze), targets)
+    matrix = DISTANCE_MATRICES.get(key)
+    if matrix is None:
+        matrix = DistanceMatrix(maze, targets)
+        DISTANCE_MATRICES[key] = matrix
+        while len(DISTANCE_MATRICES) > DISTANCE_MATRICES_SIZE:
+            DISTANCE_MATRICES.popitem(last=False)
+    DISTANCE_MATRICES.move_to_end(key)
+    return matrix
+
+
+def held_karp_order(distances):
+    """
+    Finds the shortest order to visit every item, with the Held-Karp dynamic program.
+
+    Parameters:
+        distances (list[list[int]]): Distances between the start (index 0), the items
+            (indices 1 to K) and the exit (index K + 1).
+
+    Returns:
+        tuple[list[int], int]: The item indices in visiting order and the total route length.
+
+    Notes:
+        - `cost[mask][j]` is the shortest route from the start through the items in the bitmask
+          `mask`, ending at item `j`. This takes O(2^K * K^2) time, so it is only used for small K.
+    """
+    count = len(distances) - 2
+    if count == 0:
+        return [], distances[0][1]
+    infinity = float("inf")
+    cost = [[infinity] * count for _ in range(1 << count)]
+    parent = [[-1] * count for _ in range(1 << count)]
+    for j in range(count):
+        cost[1 << j][j] = distances[0][j + 1]
+    for mask in range(1, 1 << count):
+        row = cost[mask]
+        for j in range(count):
+            current = row[j]
+            if current == infinity:
+                continue
+            from_j = distances[j + 1]
+            for n in range(count):
+                bit = 1 << n
+                if mask & bit:
+                    continue
+                candidate = current + from_j[n + 1]
+                if candidate < cost[mask | bit][n]:
+                    cost[mask | bit][n] = candidate
+                    parent[mask | bit][n] = j
+    full = (1 << count) - 1
+    last = min(range(count), key=lambda j: cost[full][j] + distances[j + 1][-1])
+    length = cost[full][last] + distances[last + 1][-1]
+    order = []
+    mask = full
+    while last >= 0:
+        order.append(last + 1)
+        mask, last = mask & ~(1 << last), parent[mask][last]
+    return order[::-1], length
+
+
+def two_opt_order(distances):
+    """
+    Finds a short order to visit every item, with a nearest-neighbor route improved by 2-opt.
+
+    Parameters:
+        distances (list[list[int]]): Distances between the start (index 0), the items
+            (indices 1 to K) and the exit (index K + 1).
+
+    Returns:
+        tuple[list[int], int]: The item indices in visiting order and the total route length.
+
+    Process:
+        1. Build a route greedily by always visiting the nearest unvisited item next.
+        2. Repeatedly reverse any section of the route whose reversal makes the route shorter,
+           until no reversal helps. The start and exit stay fixed at the ends.
+    """
+    exit_index = len(distances) - 1
+    remaining = set(range(1, exit_index))
+    route = [0]
+    while remaining:
+        nearest = min(remaining, key=lambda item: distances[route[-1]][item])
+        route.append(nearest)
+        remaining.discard(nearest)
+    route.append(exit_index)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(route) - 2):
+            for j in range(i + 1, len(route) - 1):
+                a, b = route[i - 1], route[i]
+                c, d = route[j], route[j + 1]
+                if (
+                    distances[a][c] + distances[b][d]
+                    < distances[a][b] + distances[c][d]
+                ):
+                    route[i : j + 1] = route[i : j + 1][::-1]
+                    improved = True
+    length = sum(distances[a][b] for a, b in zip(route, route[1:]))
+    return route[1:-1], length
+
+
+# Largest number of items whose visiting order is solved exactly with `held_karp_order`
+HELD_KARP_LIMIT = 13
+
+# Planned collection route: items in visiting order, route length, whether the order is optimal,
+# and every cell of the route from the start to the exit
+CollectionRoute = namedtuple("CollectionRoute", ["items", "length", "exact", "path"])
+
+
+def plan_collection(maze, start, items, end, maze_key=None, targets=None):
+    """
+    Plans the shortest route from `start` that collects every item and then reaches `end`.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position in the maze as (x, y).
+        items (Iterable[tuple]): The positions of the items to collect as (x, y).
+        end (tuple): The target position (exit) in the maze as (x, y).
+        maze_key (str | None): The precomputed `maze_hash(maze)`, if available.
+        targets (Iterable[tuple] | None): The targets of the distance matrix, which must include
+            every item and `end` (default: the items and `end`). Passing every item ever placed
+            keeps one cached matrix while items are collected.
+
+    Returns:
+        CollectionRoute: The planned route.
+
+    Raises:
+        ValueError: If an item or the exit cannot be reached from `start`.
+
+    Process:
+        1. Get the cached `DistanceMatrix` of the targets (one BFS per target), and keep the rows
+           and columns of the items and the exit.
+        2. Read the distances from `start` to each target from the BFS trees.
+        3. Order the items exactly with `held_karp_order` for up to `HELD_KARP_LIMIT` items,
+           otherwise with `two_opt_order`.
+        4. Join the shortest paths between consecutive stops into one path of cells.
+
+    Notes:
+        - The distance matrix does not depend on `start`, so planning again from another
+          position (e.g. after the player moved) reuses it.
+    """
+    items = [tuple(item) for item in items]
+    stops = items + [tuple(end)]
+    matrix = distance_matrix(maze, stops if targets is None else targets, maze_key)
+    positions = {target: i for i, target in enumerate(matrix.targets)}
+    stops = [positions[stop] for stop in stops]
+    from_targets = matrix.distances_from(start)
+    from_start = [from_targets[i] for i in stops]
+    if min(from_start) < 0:
+        raise ValueError("Every item and the exit must be reachable from the start.")
+    # Index 0 is the start, 1 to K the items and K + 1 the exit
+    distances = [[0] + from_start] + [
+        [from_start[k]] + [matrix.distances[i][j] for j in stops]
+        for k, i in enumerate(stops)
+    ]
+    exact = len(items) <= HELD_KARP_LIMIT
+    order, length = (held_karp_order if exact else two_opt_order)(distances)
+    path = [tuple(start)]
+    for stop in order + [len(items) + 1]:
+        path += matrix.path(path[-1], stops[stop - 1])[1:]
+    return CollectionRoute([items[i - 1] for i in order], length, exact, path)
+
+
+# Measurements of a maze from `analyze_maze`; see its docstring for the meaning of each field
+MazeStats = namedtuple(
+    "MazeStats",
+    [
+        "open_cells",
+        "reachable_cells",
+        "solution_length",
+        "dead_ends",
+        "junctions",
+        "decisions",
+        "branching_factor",
+        "diameter",
+        "wrong_branch_cells",
+        "difficulty",
+    ],
+)
+
+
+def analyze_maze(maze, start=(0, 1), end=None):
+    """
+    Measures the structure and difficulty of a maze in linear time, without drawing anything.
+
+    Parameters:
+        maze (list[list[int]]): The maze grid (0 for open path, 1 for wall).
+        start (tuple): The starting position as (x, y) (default: the entrance `(0, 1)`).
+        end (tuple | None): The target position as (x, y) (default: the exit `(width - 1, height - 2)`).
+
+    Returns:
+        MazeStats: The measurements, where
+            - `open_cells` is the number of path cells and `reachable_cells` the number reachable from `start`;
+            - `solution_length` is the number of steps of the shortest path (-1 if `end` is unreachable);
+            - `dead_ends` and `junctions` count path cells with one, or three or more, open neighbors;
+            - `decisions` counts the junctions on the solution path, where a solver must choose a way;
+            - `branching_factor` is the mean number of children of the non-leaf cells of the BFS
+              tree from `start`;
+            - `diameter` is the longest shortest path between two cells reachable from `start`;
+            - `wrong_branch_cells` counts reachable cells that are not on the solution path;
+            - `difficulty` is `decisions` weighted by the share of reachable cells on wrong branches.
+
+    Process:
+        1. Pad the grid with a border of walls and flatten it, so neighbors are `index +/- 1` and
+           `index +/- row width` without bounds checks.
+        2. Count each open cell's open neighbors in a single pass (dead ends and junctions).
+        3. BFS from `start`, recording parents, to get the solution and the BFS tree.
+        4. BFS again from the farthest cell found; its farthest distance is the diameter (exact for
+           perfect mazes, which are trees, and a lower bound otherwise).
+
+    Notes:
+        - The whole analysis is O(width * height), so large batches of small mazes can be screened
+          quickly (see `screen_mazes`).
+    """
+    width, height = len(maze[0]), len(maze)
+    end = end or (width - 1, height - 2)
+    row_width = width + 2
+    wall_row = b"\x01" * row_width
+    cells = (
+        wall_row + b"".join(b"\x01" + bytes(row) + b"\x01" for row in maze) + wall_row
+    )
+
+    # Cells hold 0 (path) or 1 (wall), so the open neighbors are 4 minus the neighboring walls
+    open_indices = [index for index, cell in enumerate(cells) if cell == 0]
+    degree_counts = [0] * 5
+    for index in open_indices:
+        degree_counts[
+            4
+            - cells[index + 1]
+            - cells[index - 1]
+            - cells[index + row_width]
+            - cells[index - row_width]
+        ] += 1
+    dead_ends = degree_counts[1]
+    junctions = degree_counts[3] + degree_counts[4]
+
+    def sweep(source, parents=None):
+        # Level-by-level BFS; returns the number of cells reached, the last cell and its distance.
+        # `parents`, if given, is filled with each reached cell's BFS parent.
+        seen = bytearray(cells)
+        seen[source] = 1
+        level = [source]
+        reached = 0
+        distance = -1
+        while level:
+            reached += len(level)
+            distance += 1
+            last = level[-1]
+            next_level = []
+            for current in level:
+                for next_index in (
+                    current + 1,
+                    current - 1,
+                    current + row_width,
+                    current - row_width,
+                ):
+                    if not seen[next_index]:
+                        seen[next_index] = 1
+                        next_level.append(next_index)
+                        if parents is not None:
+                            parents[next_index] = current
+            level = next_level
+        return reached, last, distance
+
+    source = (start[1] + 1) * row_width + start[0] + 1
+    target = (end[1] + 1) * row_width + end[0] + 1
+    parents = [-1] * len(cells)
+    reachable, farthest, _ = sweep(source, parents)
+    _, _, diameter = sweep(farthest)
+
+    non_leaves = len(set(parents)) - 1  # Minus the -1 of the start and unreached cells
+    branching_factor = (reachable - 1) / non_leaves if non_leaves else 0.0
+    if target == source or parents[target] >= 0:
+        path = [target]
+        while path[-1] != source:
+            path.append(parents[path[-1]])
+        solution_length = len(path) - 1
+        decisions = sum(
+            1
+            for index in path[1:]
+            if cells[index + 1]
+            + cells[index - 1]
+            + cells[index + row_width]
+            + cells[index - row_width]
+            <= 1
+        )
+        wrong_branch_cells = reachable - len(path)
+    else:
+        solution_length = -1
+        decisions = 0
+        wrong_branch_cells = reachable
+    difficulty = decisions * wrong_branch_cells / reachable if reachable else 0.0
+    return MazeStats(
+        len(open_indices),
+        reachable,
+        solution_length,
+        dead_ends,
+        junctions,
+        decisions,
+        branching_factor,
+        diameter,
+        wrong_branch_cells,
+        difficulty,
+    )
+
+
+def screen_mazes(count, width, height, min_difficulty=0.0, max_difficulty=None):
+    """
+    Generates mazes with `create_maze` and yields those whose difficulty is in range.
+
+    Parameters:
+        count (int): The number of mazes to generate.
+        width (int): The width of each maze in cells (must be odd).
+        height (int): The height of each maze in cells (must be odd).
+        min_difficulty (float): The lowest accepted `MazeStats.difficulty`.
+        max_difficulty (float | None): The highest accepted difficulty (no limit if None).
+
+    Yields:
+        tuple[list[list[int]], MazeStats]: Each accepted maze with its measurements.
+    """
+    for _ in range(count):
+        maze = create_maze(width, height)
+        stats = analyze_maze(maze)
+        if stats.difficulty >= min_difficulty and (
+            max_difficulty is None or stats.difficulty <= max_difficulty
+        ):
+            yield maze, stats
+
+
+class TracePlayer:
+    """
+    Plays a `SearchTrace` back on a `MazeGame` with play/pause, seeking and variable speed.
+
+    Expanded cells are painted in the algorithm's color and cells on the frontier in
+    `FRONTIER_COLOR`. Seeking only repaints the cells that differ between the shown step and
+    the target step, and the frontier is rebuilt from the trace's nearest checkpoint, so jumping
+    anywhere in the trace never replays the search from the beginning.
+
+    Attributes:
+        game (MazeGame): The game whose renderer is drawn on.
+        trace (SearchTrace): The trace being played.
+        color (str): The color used for expanded cells.
+        position (int): The step currently shown (number of expansions painted).
+        frontier (set[int]): Cell indices currently painted as frontier.
+        playing (bool): Whether playback is advancing.
+        speed_level (int): Index into `SPEEDS` of the current playback speed.
+        scheduled (bool): Whether a playback tick is pending.
+    """
+
+    SPEEDS = (1, 2, 4, 8, 16, 32, 64, 128)  # Steps advanced per tick
+    FRONTIER_COLOR = "gray"
+
+    def __init__(self, game, trace, color):
+        self.game = game
+        self.trace = trace
+        self.color = color
+        self.position = 0
+        self.frontier = set()
+        self.playing = False
+        self.speed_level = 0
+        self.scheduled = False
+
+    def paint(self, index, color=None):
+        """
+        Paints the cell at `index`; without a color, restores the cell's color in the plain maze.
+        """
+        x, y = self.trace.cell(index)
+        self.game.renderer.fill_cell(x, y, color or self.game.base_color(x, y))
+
+    def seek(self, step):
+        """
+        Shows the state of the search after `step` expansions.
+
+        Process:
+            1. Rebuild the frontier at `step` from the trace's checkpoints.
+            2. Restore cells that left the frontier.
+            3. Paint (when moving forward) or restore (when moving backward) the cells expanded
+               between the shown step and `step`.
+            4. Paint cells that joined the frontier.
+        """
+        step = max(0, min(step, len(self.trace)))
+        if step == self.position:
+            return
+        frontier = self.trace.frontier_at(step)
+        for index in self.frontier - frontier:
+            self.paint(index)
+        if step > self.position:
+            for index in self.trace.expanded[self.position : step]:
+                self.paint(index, self.color)
+        else:
+            for index in self.trace.expanded[step : self.position]:
+                self.paint(index)
+        for index in frontier - self.frontier:
+            self.paint(index, self.FRONTIER_COLOR)
+        self.frontier = frontier
+        self.position = step
+        self.game.renderer.update_slider(self.game.trace_slider, step, len(self.trace))
+        self.game.renderer.refresh()
+
+    def tick(self):
+        """
+        Advances playback by the current speed and schedules the next tick.
+        """
+        if not self.playing:
+            self.scheduled = False
+            return
+        self.seek(self.position + self.SPEEDS[self.speed_level])
+        if self.position >= len(self.trace):
+            self.playing = False
+            self.scheduled = False
+            return
+        self.game.renderer.after(STEP_DELAY, self.tick)
+
+    def play(self):
+        """
+        Starts playback, restarting from the beginning if the end was reached.
+        """
+        if self.position >= len(self.trace):
+            self.seek(0)
+        self.playing = True
+        if not self.scheduled:
+            self.scheduled = True
+            self.tick()
+
+    def pause(self):
+        """
+        Pauses playback.
+        """
+        self.playing = False
+
+    def toggle(self):
+        """
+        Toggles between playing and paused.
+        """
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def step_forward(self):
+        """
+        Pauses and shows the next step.
+        """
+        self.pause()
+        self.seek(self.position + 1)
+
+    def step_back(self):
+        """
+        Pauses and shows the previous step.
+        """
+        self.pause()
+        self.seek(self.position - 1)
+
+    def rewind(self):
+        """
+        Shows the start of the search.
+        """
+        self.seek(0)
+
+    def to_end(self):
+        """
+        Shows the end of the search.
+        """
+        self.seek(len(self.trace))
+
+    def faster(self):
+        """
+        Doubles the playback speed (up to the last entry of `SPEEDS`).
+        """
+        self.speed_level = min(self.speed_level + 1, len(self.SPEEDS) - 1)
+
+    def slower(self):
+        """
+        Halves the playback speed (down to one step per tick).
+        """
+        self.speed_level = max(self.speed_level - 1, 0)
+
+
+# Keys that control trace playback, mapped to `TracePlayer` methods
+PLAYBACK_KEYS = {
+    "space": "toggle",
+    "period": "step_forward",
+    "comma": "step_back",
+    "Home": "rewind",
+    "End": "to_end",
+    "plus": "faster",
+    "equal": "faster",
+    "minus": "slower",
+}
+
+# File written by the Save button and read by the --load command line option
+TRACE_FILE = "maze_traces.json"
+
 
 class MazeGame:
     """
     A class to represent a maze game with different pathfinding algorithms.
 
-    This class creates a maze, initializes a graphical user interface (GUI) using Tkinter,
-    and provides various algorithms to find a path through the maze. It supports Depth-First Search (DFS),
-    Breadth-First Search (BFS), Dijkstra's Algorithm, and A* Algorithm for pathfinding. The player can move
+    This class creates a maze, initializes a graphical user interface (GUI) through a `Renderer`
+    (Tkinter or pygame), and provides various algorithms to find a path through the maze. It supports Depth-First Search (DFS),
+    Breadth-First Search (BFS), Dijkstra's Algorithm, A* Algorithm and hierarchical A* (HPA*) for pathfinding. The player can move
     within the maze using keyboard controls.
 
+    Searches run at full speed into a `SearchTrace`, which is then played back with a `TracePlayer`
+    that can be paused, stepped, sped up or slowed down, and seeked with the slider. Searches go
+    through a `SolveCache`, so replaying a search that was already run does not recompute it. The Race button
+    solves the maze with every algorithm at once in worker processes and shows a ranked table.
+
+    In collection mode (the Items button), items are placed in the maze and must all be collected
+    before the exit counts as a win; the Route button shows the shortest collection route from the
+    player's position, planned with `plan_collection`.
+
     Attributes:
         width (int): The width of the maze in cells.
         height (int): The height of the maze in cells.
@@ -29,137 +2767,128 @@ class MazeGame:
         maze (list[list[int]]): 2D list representing the maze grid (0 for open path, 1 for wall).
         player_pos (list[int]): The current position of the player in the maze.
         visited (set[tuple[int, int]]): Set of visited positions during pathfinding.
-        root (tk.Tk): The main Tkinter window.
-        canvas (tk.Canvas): The canvas used to draw the maze and player.
-        dfs_button (tk.Button): Button to start Depth-First Search.
-        bfs_button (tk.Button): Button to start Breadth-First Search.
-        dijkstra_button (tk.Button): Button to start Dijkstra's Algorithm.
-        a_star_button (tk.Button): Button to start A* Algorithm.
+        renderer (Renderer): The backend used to draw the maze and player and to handle input.
+        dfs_button (tk.Button | pygame.Rect): Button to start Depth-First Search.
+        bfs_button (tk.Button | pygame.Rect): Button to start Breadth-First Search.
+        dijkstra_button (tk.Button | pygame.Rect): Button to start Dijkstra's Algorithm.
+        a_star_button (tk.Button | pygame.Rect): Button to start A* Algorithm.
+        hpa_button (tk.Button | pygame.Rect): Button to start hierarchical pathfinding (HPA*).
+        play_button (tk.Button | pygame.Rect): Button to play or pause the current trace.
+        trace_slider (tk.Scale | SimpleNamespace): Slider used to seek within the current trace.
+        traces (dict[str, SearchTrace]): The latest trace shown for each algorithm key (written by Save).
+        cache (SolveCache): The cache that searches go through.
+        maze_key (str): The content hash of `maze`, computed once for cache lookups.
+        playback (TracePlayer | None): The player for the trace currently shown.
+        race_button (tk.Button | pygame.Rect): Button to race all algorithms in parallel.
+        race_pool (concurrent.futures.ProcessPoolExecutor | None): Worker processes for races,
+            created on the first race and reused afterwards.
+        race_futures (list[concurrent.futures.Future] | None): Pending results of a running race.
+        race_started (float): `time.perf_counter()` value when the running race was started.
+        items (set[tuple[int, int]]): Positions of the items to collect in collection mode.
+        collected (set[tuple[int, int]]): Items the player has already collected.
+        items_button (tk.Button | pygame.Rect): Button to place new items to collect.
+        route_button (tk.Button | pygame.Rect): Button to show the shortest collection route.
+        route_animation (object | None): Token of the running route animation; starting a new
+            animation replaces it, which stops the old one.
     """
 
-    def __init__(self, width, height, cell_size):
+    def __init__(
+        self,
+        width,
+        height,
+        cell_size=None,
+        renderer=TkRenderer,
+        maze=None,
+        traces=(),
+        cache=SOLVE_CACHE,
+    ):
         """
         Initializes the MazeGame class.
 
         Args:
             width (int): The width of the maze in cells.
             height (int): The height of the maze in cells.
-            cell_size (int): The size of each cell in pixels.
+            cell_size (int | None): The size of each cell in pixels (default: the largest size
+                that fits the maze in `MAX_BOARD_SIZE` pixels, see `fit_cell_size`).
+            renderer (type[Renderer]): The renderer class used to draw the game (default: `TkRenderer`).
+            maze (list[list[int]] | None): An existing maze to play (e.g. loaded with `load_traces`);
+                its dimensions replace `width` and `height`. A new maze is generated if omitted.
+            traces (Iterable[SearchTrace]): Previously recorded traces for `maze`, which the
+                algorithm buttons replay instead of searching again.
+            cache (SolveCache): The cache that searches go through (default: `SOLVE_CACHE`).
 
         Sets up the maze, GUI components, and initializes player position.
         """
+        if maze is not None:
+            width, height = len(maze[0]), len(maze)
         self.width = width
         self.height = height
-        self.cell_size = cell_size
-        self.maze = self.create_maze()  # Create the maze
+        self.cell_size = cell_size or fit_cell_size(width, height)
+        self.maze = maze if maze is not None else self.create_maze()  # Create the maze
         self.player_pos = [0, 1]  # Start position
         self.visited = set()  # Set to keep track of visited positions
-        self.root = tk.Tk()  # Initialize the Tkinter root window
-        self.root.title("Maze algorithms solver")
-        self.canvas = tk.Canvas(
-            self.root,
-            width=self.width * self.cell_size,
-            height=self.height * self.cell_size,
-            bg="black",
+        self.traces = {trace.algorithm: trace for trace in traces}
+        self.cache = cache
+        self.maze_key = maze_hash(self.maze)
+        for trace in self.traces.values():
+            self.cache.put(
+                self.cache_key(trace.algorithm, trace.start, trace.end), trace
+            )
+        self.playback = None
+        self.race_pool = None
+        self.race_futures = None
+        self.race_started = 0.0
+        self.items = set()
+        self.collected = set()
+        self.route_animation = None
+        self.renderer = renderer(
+            self.width, self.height, self.cell_size, "Maze algorithms solver"
         )
-        # Create and pack buttons for different pathfinding algorithms
-        self.canvas.pack()
-        self.dfs_button = tk.Button(self.root, text="DFS", command=self.dfs_bot)
-        self.dfs_button.pack(side=tk.LEFT, padx=5, pady=5)
-        self.bfs_button = tk.Button(self.root, text="BFS", command=self.bfs_bot)
-        self.bfs_button.pack(side=tk.LEFT, padx=5, pady=5)
-        self.dijkstra_button = tk.Button(
-            self.root, text="Dijkstra", command=self.dijkstra_bot
-        )
-        self.dijkstra_button.pack(side=tk.LEFT, padx=5, pady=5)
-        self.a_star_button = tk.Button(
-            self.root, text="A* Algorithm", command=self.a_star_bot
-        )
-        self.a_star_button.pack(side=tk.LEFT, padx=5, pady=5)
-        # Draw the maze and player on the canvas
-        self.draw_maze()  # Draw the maze on the canvas
-        self.draw_player()  # Draw the player on the canvas
-        # Bind key press events to move the player
-        self.root.bind("<KeyPress>", self.move_player)
-        self.root.mainloop()  # Start the Tkinter event loop
+        # Create buttons for different pathfinding algorithms
+        self.dfs_button = self.renderer.add_button("DFS", self.dfs_bot)
+        self.bfs_button = self.renderer.add_button("BFS", self.bfs_bot)
+        self.dijkstra_button = self.renderer.add_button("Dijkstra", self.dijkstra_bot)
+        self.a_star_button = self.renderer.add_button("A* Algorithm", self.a_star_bot)
+        self.hpa_button = self.renderer.add_button("HPA*", self.hpa_bot)
+        self.race_button = self.renderer.add_button("Race", self.race_bot)
+        self.items_button = self.renderer.add_button("Items", self.place_items)
+        self.route_button = self.renderer.add_button("Route", self.route_bot)
+        # Create playback controls for recorded searches
+        self.play_button = self.renderer.add_button(
+            "Play/Pause", lambda: self.control_playback("toggle")
+        )
+        self.renderer.add_button("Slower", lambda: self.control_playback("slower"))
+        self.renderer.add_button("Faster", lambda: self.control_playback("faster"))
+        self.renderer.add_button("Save", self.save_traces)
+        self.trace_slider = self.renderer.add_slider(
+            lambda step: self.control_playback("seek", step)
+        )
+        # Draw the maze and player
+        self.draw_maze()  # Draw the maze
+        self.draw_player()  # Draw the player
+        # Bind key press events to move the player and control playback
+        self.renderer.bind_keys(self.handle_key)
+        self.renderer.run()  # Start the renderer's event loop
+        if self.race_pool is not None:
+            self.race_pool.shutdown(cancel_futures=True)
+        self.cache.save()
 
     def create_maze(self):
         """
-        Generates a random maze using the Depth-First Search (DFS) algorithm.
-
-        This method initializes a maze grid where all cells are initially walls. It then
-        uses a stack-based approach to create a path through the maze. The path is created
-        by randomly selecting neighboring cells, marking them as part of the path, and
-        removing walls between cells. The maze is ensured to have an entrance and an exit.
-
-        The resulting maze is a 2D list where:
-        - `0` represents a path.
-        - `1` represents a wall.
+        Generates a random maze of the game's size with `create_maze`.
 
         Returns:
             list[list[int]]: A 2D list representing the generated maze. Each cell in the maze
             is either a `0` (path) or `1` (wall).
-
-        Algorithm:
-            1. Initialize the maze grid with walls (`1`).
-            2. Set the starting position at `(1, 1)` as a path (`0`).
-            3. Use a stack to keep track of the current path.
-            4. Shuffle possible directions to ensure randomness.
-            5. For each position:
-                - Check the unvisited neighboring cells.
-                - If there are unvisited neighbors, randomly select one, mark it as a path,
-                  and remove the wall between the current cell and the neighbor.
-                - If no unvisited neighbors are available, backtrack by popping the stack.
-            6. Ensure there is an entrance at `(1, 0)` and an exit at `(self.height - 2, self.width - 1)`.
-            7. Return the generated maze.
-
-        Notes:
-            - The maze is guaranteed to have at least one path from the entrance to the exit.
-            - The `DIRS` variable should be defined elsewhere in the code, typically as a list of possible directions
-              [(0, 1), (1, 0), (0, -1), (-1, 0)] representing right, down, left, and up, respectively.
-        """
-        maze = [
-            [1 for _ in range(self.width)] for _ in range(self.height)
-        ]  # Start with walls everywhere
-        stack = [(1, 1)]  # Stack to keep track of the current path
-        maze[1][1] = 0  # Starting point
-
-        while stack:
-            x, y = stack[-1]  # Get the current position
-
-            # Shuffle the directions to randomize the path
-            random.shuffle(DIRS)
-            # Get the list of unvisited neighbors
-            neighbors = [
-                (x + dx, y + dy)
-                for dx, dy in DIRS
-                if 0 < x + dx < self.width - 1
-                and 0 < y + dy < self.height - 1
-                and maze[y + dy][x + dx] == 1
-            ]
-
-            if neighbors:
-                nx, ny = random.choice(neighbors)  # Choose a random neighbor
-                stack.append((nx, ny))  # Add the neighbor to the stack
-                maze[ny][nx] = 0  # Mark the neighbor as a path
-                maze[ny - (ny - y) // 2][
-                    nx - (nx - x) // 2
-                ] = 0  # Remove the wall between cells
-            else:
-                stack.pop()  # Backtrack if no unvisited neighbors
-
-        # Ensure there is a path from the start to the end
-        maze[1][0] = 0  # Entrance
-        maze[self.height - 2][self.width - 1] = 0  # Exit
-
-        return maze
+        """
+        return create_maze(self.width, self.height)
 
     def draw_maze(self):
         """
-        Draws the generated maze onto the Tkinter canvas.
+        Draws the generated maze through the renderer.
 
-        This method iterates over the 2D list representing the maze and draws each cell as a rectangle on
-        the canvas. The color of the rectangle is determined by whether the cell is a path or a wall. The
+        This method iterates over the 2D list representing the maze and paints each cell with
+        the renderer. The color of the rectangle is determined by whether the cell is a path or a wall. The
         method also draws the entrance and exit of the maze with distinct colors.
 
         The maze is visualized as follows:
@@ -171,90 +2900,89 @@ class MazeGame:
         Process:
             1. Iterate through each cell in the maze.
                 - For each cell, determine its color based on its value (`0` or `1`).
-                - Draw a rectangle representing the cell at the appropriate position on the canvas.
-            2. Draw a green rectangle to represent the entrance of the maze.
-            3. Draw a red rectangle to represent the exit of the maze.
-
-        Canvas Coordinates:
-            - The top-left corner of the canvas is at (0, 0).
-            - Each cell's position is calculated based on its index in the maze and the cell size.
-            - The entrance is drawn at the top-left corner.
-            - The exit is drawn at the bottom-right corner.
+                - Paint the cell at its position in the maze.
+            2. Paint the entrance of the maze green.
+            3. Paint the exit of the maze red.
 
         Notes:
-            - The canvas is assumed to be initialized with dimensions large enough to accommodate the entire maze.
-            - The entrance and exit rectangles are hardcoded to specific sizes and positions based on the cell size.
+            - The renderer is responsible for converting cell coordinates to pixels.
+            - The entrance is the cell `(0, 1)` and the exit is the cell `(self.width - 1, self.height - 2)`.
         """
         for y in range(len(self.maze)):
             for x in range(len(self.maze[0])):
                 color = "white" if self.maze[y][x] == 0 else "black"  # Path or wall
-                self.canvas.create_rectangle(
-                    x * self.cell_size,
-                    y * self.cell_size,
-                    (x + 1) * self.cell_size,
-                    (y + 1) * self.cell_size,
-                    fill=color,
-                )
-        # Draw the entrance
-        self.canvas.create_rectangle(
-            0, self.cell_size, self.cell_size, 2 * self.cell_size, fill="green"
-        )
-        # Draw the exit
-        self.canvas.create_rectangle(
-            (self.width - 1) * self.cell_size,
-            (self.height - 2) * self.cell_size,
-            self.width * self.cell_size,
-            (self.height - 1) * self.cell_size,
-            fill="red",
-        )
+                self.renderer.fill_cell(x, y, color)
+        self.draw_entrance_and_exit()
 
-    def draw_player(self):
+    def draw_entrance_and_exit(self):
+        """
+        Paints the entrance of the maze green and the exit red.
         """
-        Draws the player on the Tkinter canvas.
+        self.renderer.fill_cell(0, 1, "green")  # Entrance
+        self.renderer.fill_cell(self.width - 1, self.height - 2, "red")  # Exit
 
-        This method places a visual representation of the player at the current position on the canvas.
-        The player is drawn as a blue rectangle, and is tagged with "player" for easy identification and manipulation.
+    def base_color(self, x, y):
+        """
+        Returns the color of the open cell at `(x, y)` when no search or route is shown.
 
-        Process:
-            1. Retrieve the current position of the player from `self.player_pos`.
-            2. Calculate the top-left and bottom-right coordinates of the rectangle representing the player
-               based on the player's position and the cell size.
-            3. Draw a blue rectangle at the calculated coordinates on the canvas.
-            4. Assign the tag "player" to the rectangle, which allows for easy manipulation or identification later.
+        Returns:
+            str: "green" for the entrance, "red" for the exit, "gold" for an item still to be
+            collected, and "white" for any other path cell.
+        """
+        if (x, y) == (0, 1):
+            return "green"  # Entrance
+        if (x, y) == (self.width - 1, self.height - 2):
+            return "red"  # Exit
+        if (x, y) in self.items and (x, y) not in self.collected:
+            return "gold"  # Item to collect
+        return "white"
 
-        Canvas Coordinates:
-            - The top-left corner of the player rectangle is calculated as `(x * self.cell_size, y * self.cell_size)`.
-            - The bottom-right corner of the player rectangle is calculated as `((x + 1) * self.cell_size, (y + 1) * self.cell_size)`.
+    def draw_player(self):
+        """
+        Draws the player through the renderer.
+
+        This method places a visual representation of the player at the current position.
+        The player is drawn as a blue cell above the maze; the renderer removes it from its
+        previous position.
 
         Notes:
             - The `self.player_pos` attribute should contain the current (x, y) position of the player in the maze.
-            - If the player is moved or if the maze is redrawn, this method should be called to update the player's position on the canvas.
-            - The "player" tag allows for potential future use cases, such as moving or updating the player's position on the canvas.
+            - If the player is moved, this method should be called to update the player's position on screen.
 
         Example:
             If `self.player_pos` is `[2, 3]` and `self.cell_size` is `20`, the player will be drawn as a blue rectangle
-            from `(40, 60)` to `(60, 80)` on the canvas.
+            from `(40, 60)` to `(60, 80)` on screen.
         """
         x, y = self.player_pos
-        self.canvas.create_rectangle(
-            x * self.cell_size,
-            y * self.cell_size,
-            (x + 1) * self.cell_size,
-            (y + 1) * self.cell_size,
-            fill="blue",
-            tags="player",
-        )
+        self.renderer.set_player(x, y)
+
+    def handle_key(self, event):
+        """
+        Dispatches a key press to player movement or trace playback.
+
+        Parameters:
+            event (tk.Event): The key event; any renderer passes an object with a Tk-style `keysym` attribute.
+
+        Notes:
+            - Arrow keys move the player (see `MOVE_DIRS`).
+            - Playback keys are listed in `PLAYBACK_KEYS`: space plays or pauses, `,` and `.` step
+              backward and forward, Home and End jump to the start and end, `+` and `-` change speed.
+        """
+        if event.keysym in MOVE_DIRS:
+            self.move_player(event)
+        elif event.keysym in PLAYBACK_KEYS:
+            self.control_playback(PLAYBACK_KEYS[event.keysym])
 
     def move_player(self, event):
         """
-        Moves the player on the canvas based on keyboard input.
+        Moves the player based on keyboard input.
 
-        This method is triggered by key press events and updates the player's position on the canvas accordingly.
+        This method is triggered by key press events and updates the player's position on screen accordingly.
         It also handles checking if the new position is valid (i.e., within maze boundaries and not a wall),
         updates the visited paths, and checks for a win condition.
 
         Parameters:
-            event (tk.Event): The Tkinter event object containing information about the key press.
+            event (tk.Event): The key event; any renderer passes an object with a Tk-style `keysym` attribute.
 
         Process:
             1. Retrieve the direction of movement based on the key pressed. `MOVE_DIRS` maps key symbols to movement offsets (dx, dy).
@@ -263,15 +2991,17 @@ class MazeGame:
             4. If the new position is valid:
                 - Mark the current position as visited by adding it to `self.visited`.
                 - Update the player's position to the new coordinates.
-                - Remove the previous player representation from the canvas.
                 - Redraw the player at the new position.
                 - Update the visualization of visited paths.
-                - Check for a win condition (if the player reaches the exit) and display a "You Win!" message.
+                - Collect the item at the new position, if there is one.
+                - Check for a win condition (if the player reaches the exit with every item collected)
+                  and display a "You Win!" message.
 
         Notes:
             - The `event.keysym` attribute provides the symbol of the key pressed, which is used to determine the direction of movement.
             - The `MOVE_DIRS` dictionary should be defined elsewhere in the class, mapping key symbols (e.g., "Up", "Down", "Left", "Right") to movement offsets.
             - The win condition is checked by comparing the player's position with the exit coordinates.
+            - Without items (outside collection mode), reaching the exit always wins.
 
         Example:
             If the `event.keysym` is "Right" and `MOVE_DIRS` is set such that "Right" maps to `(1, 0)`, the player will move one cell to the right.
@@ -288,97 +3018,68 @@ class MazeGame:
         ):
             self.visited.add(tuple(self.player_pos))  # Mark current position as visited
             self.player_pos = [new_x, new_y]  # Update player position
-            self.canvas.delete("player")  # Remove the old player position
             self.draw_player()  # Draw the new player position
             self.update_visited_paths()  # Update the visited paths
+            if (new_x, new_y) in self.items:
+                self.collected.add((new_x, new_y))  # Collect the item
 
             # Check for win condition
-            if new_x == self.width - 1 and new_y == self.height - 2:
-                self.canvas.create_text(
-                    self.width * self.cell_size / 2,
-                    self.height * self.cell_size / 2,
-                    text="You Win!",
-                    fill="yellow",
-                    font=("Helvetica", 24),
-                )
+            if (
+                new_x == self.width - 1
+                and new_y == self.height - 2
+                and self.collected >= self.items
+            ):
+                self.renderer.show_text("You Win!", "yellow")
 
     def update_visited_paths(self):
         """
-        Updates the canvas to reflect the visited paths and redraw the player.
+        Updates the display to reflect the visited paths.
 
         This method is responsible for visualizing the cells that the player has visited
-        by updating their appearance on the canvas. It first removes the player from the canvas
-        to ensure that it is redrawn on top of the visited paths. Then, it iterates through
-        the set of visited positions and updates their appearance. Finally, the player is
-        redrawn at its current position.
+        by updating their appearance through the renderer. It iterates through the set of
+        visited positions and repaints them; the renderer keeps the player drawn on top.
 
         Process:
-            1. Remove the existing player representation from the canvas to ensure it is not
-               obscured by the visited path drawings.
-            2. Iterate over the positions stored in `self.visited` and draw each visited cell
+            1. Iterate over the positions stored in `self.visited` and paint each visited cell
                with a specified color to indicate that it has been traversed.
-            3. Redraw the player at its current position to ensure it is visible above the
-               visited paths.
 
         Notes:
             - `self.visited` should be a set of tuples where each tuple represents a
               (x, y) coordinate of a cell that has been visited by the player.
             - The `fill_color` used for visited paths is set to "light green".
-            - The player is always drawn with a "blue" fill color.
-            - The player must be redrawn after the visited paths to ensure it is not covered.
+            - The player is always drawn with a "blue" fill color above the maze.
 
         Example:
             If the player has visited the cells at coordinates (1, 1) and (2, 2),
             these cells will be drawn with a "light green" color, and the player
             will be drawn with a "blue" color at its current position.
         """
-        self.canvas.delete(
-            "player"
-        )  # Remove the player to redraw it on top if necessary
-
-        # First redraw all visited paths
+        # Redraw all visited paths
         for pos in self.visited:
             x, y = pos
             fill_color = "light green"
-            self.canvas.create_rectangle(
-                x * self.cell_size,
-                y * self.cell_size,
-                (x + 1) * self.cell_size,
-                (y + 1) * self.cell_size,
-                fill=fill_color,
-            )
-
-        # Then redraw the player at its current position
-        x, y = self.player_pos
-        self.canvas.create_rectangle(
-            x * self.cell_size,
-            y * self.cell_size,
-            (x + 1) * self.cell_size,
-            (y + 1) * self.cell_size,
-            fill="blue",
-            tags="player",
-        )
+            self.renderer.fill_cell(x, y, fill_color)
 
     def clear_search_paths(self):
         """
-        Clears the canvas of all search path indicators and redraws the maze.
+        Clears all search path indicators and redraws the maze.
 
         This method is used to remove any temporary visual markers indicating search paths
-        from the canvas. It iterates over the entire maze and resets the color of cells
+        from the display. It iterates over the entire maze and resets the color of cells
         that were previously marked during a search algorithm (e.g., A* or BFS). The maze
         is then redrawn with its original appearance, including the entrance and exit.
 
         Process:
             1. Iterate through each cell in the maze.
             2. For cells that are part of the maze path (indicated by a value of 0 in `self.maze`),
-               reset their color to white, which represents an open path.
-            3. Redraw the entrance of the maze at the top-left corner in green.
-            4. Redraw the exit of the maze at the bottom-right corner in red.
+               reset their color with `base_color`: white for an open path, green for the
+               entrance, red for the exit and gold for items still to be collected.
 
         Notes:
             - This method is typically called to reset the visual representation of the maze
               after a search algorithm has been executed and its path markers need to be cleared.
-            - The entrance is drawn as a green rectangle, and the exit is drawn as a red rectangle.
+            - The entrance is drawn as a green cell, and the exit is drawn as a red cell.
+            - Cells the player visited are repainted too, so their light green marking is cleared.
             - The `self.maze` attribute represents the maze layout, where 0 denotes open paths
               and 1 denotes walls.
 
@@ -391,47 +3092,28 @@ class MazeGame:
         for y in range(len(self.maze)):
             for x in range(len(self.maze[0])):
                 if self.maze[y][x] == 0:
-                    self.canvas.create_rectangle(
-                        x * self.cell_size,
-                        y * self.cell_size,
-                        (x + 1) * self.cell_size,
-                        (y + 1) * self.cell_size,
-                        fill="white",
-                    )
-        # Redraw the entrance and exit
-        self.canvas.create_rectangle(
-            0, self.cell_size, self.cell_size, 2 * self.cell_size, fill="green"
-        )
-        self.canvas.create_rectangle(
-            (self.width - 1) * self.cell_size,
-            (self.height - 2) * self.cell_size,
-            self.width * self.cell_size,
-            (self.height - 1) * self.cell_size,
-            fill="red",
-        )
+                    self.renderer.fill_cell(x, y, self.base_color(x, y))
 
     def dfs_bot(self):
         """
         Initiates Depth-First Search (DFS) to find a path from the start to the exit in the maze.
 
-        This method serves as the entry point for performing DFS in the maze. It first clears any
-        previous search paths from the canvas, then calls the `depth_first_search` method to
-        start the search process.
+        This method serves as the entry point for performing DFS in the maze. It calls the
+        `depth_first_search` method, which records the search and plays it back.
 
         The search starts from the predefined starting point `(1, 1)` and aims to reach the
-        predefined exit point `(self.width - 1, self.height - 2)`. As the search progresses,
+        predefined exit point `(self.width - 1, self.height - 2)`. As the playback progresses,
         cells are painted to visually indicate the path being explored.
 
         Notes:
-            - The method clears the canvas of previous search paths before initiating DFS.
+            - Previous search paths are cleared from the display before the playback starts.
             - The start and end points are fixed for this implementation.
-            - The cells being visited are painted in yellow during the search.
+            - The cells being visited are painted in yellow during the playback.
 
         Example:
             Calling `dfs_bot()` will begin the DFS algorithm, updating the maze visualization
             with the path being explored and eventually finding the path to the exit if it exists.
         """
-        self.clear_search_paths()
         start = (1, 1)
         end = (self.width - 1, self.height - 2)
         self.depth_first_search(start, end)
@@ -440,96 +3122,38 @@ class MazeGame:
         """
         Performs Depth-First Search (DFS) to find a path from `start` to `end` in the maze.
 
-        This method performs the DFS algorithm to explore the maze and find a path from the
-        `start` position to the `end` position. As the search progresses, each visited cell is
-        painted in yellow to indicate the path being explored.
+        The search runs at full speed with `solve_dfs` and the resulting trace is played back,
+        painting each visited cell in yellow to indicate the path being explored.
 
         Parameters:
             start (tuple): The starting position in the maze as (x, y).
             end (tuple): The target position (exit) in the maze as (x, y).
 
-        Process:
-            1. Initialize a stack with the starting position and the current path.
-            2. Maintain a set of visited positions to avoid revisiting cells.
-            3. Use a recursive function `step` to handle the search process:
-                - If the stack is not empty, pop the current position and path.
-                - Paint the current cell in yellow and update the canvas.
-                - If the current position is the end, terminate the search.
-                - Otherwise, explore the neighboring cells by adding them to the stack if they
-                  are valid and not visited.
-                - Schedule the next step in the search process using `root.after`.
-
-        Notes:
-            - The recursive `step` function ensures the search progresses by periodically
-              updating the canvas and scheduling the next search step.
-            - Cells are painted yellow during the search to visually represent the exploration
-              process.
-            - The search continues until the exit is reached or all possible paths are explored.
-
         Example:
             If you call `depth_first_search((1, 1), (10, 10))`, the maze will be explored using DFS,
-            and the path will be visualized with yellow cells. If a path exists, it will be found
-            and displayed.
+            and the exploration will be replayed with yellow cells.
         """
-        stack = [(start, [start])]
-        visited = set()
-
-        def step():
-            if stack:
-                current, path = stack.pop()
-                if current in visited:
-                    self.root.after(50, step)
-                    return
-                visited.add(current)
-
-                # Paint the current cell
-                self.canvas.create_rectangle(
-                    current[0] * self.cell_size,
-                    current[1] * self.cell_size,
-                    (current[0] + 1) * self.cell_size,
-                    (current[1] + 1) * self.cell_size,
-                    fill="yellow",
-                )
-                self.canvas.update()  # Force update the canvas
-
-                if current == end:
-                    return  # End the search if the exit is reached
-
-                for direction in MOVE_DIRS.values():
-                    next_pos = (current[0] + direction[0], current[1] + direction[1])
-                    if (
-                        0 <= next_pos[0] < self.width
-                        and 0 <= next_pos[1] < self.height
-                        and self.maze[next_pos[1]][next_pos[0]] == 0
-                        and next_pos not in visited
-                    ):
-                        stack.append((next_pos, path + [next_pos]))
-
-                self.root.after(50, step)  # Schedule the next step
-
-        step()
+        self.play_trace(self.trace_for("dfs", start, end))
 
     def bfs_bot(self):
         """
         Initiates Breadth-First Search (BFS) to find a path from the start to the exit in the maze.
 
-        This method clears any previous search paths from the canvas and then calls the
-        `breadth_first_search` method to begin the BFS process.
+        This method calls the `breadth_first_search` method, which records the search and plays it back.
 
         The search starts from the predefined starting point `(1, 1)` and aims to reach
-        the predefined exit point `(self.width - 1, self.height - 2)`. As the search progresses,
+        the predefined exit point `(self.width - 1, self.height - 2)`. As the playback progresses,
         cells are painted to visually indicate the path being explored.
 
         Notes:
-            - The method clears the canvas of previous search paths before initiating BFS.
+            - Previous search paths are cleared from the display before the playback starts.
             - The start and end points are fixed for this implementation.
-            - The cells being visited are painted in light blue during the search.
+            - The cells being visited are painted in light blue during the playback.
 
         Example:
             Calling `bfs_bot()` will begin the BFS algorithm, updating the maze visualization
             with the path being explored and eventually finding the path to the exit if it exists.
         """
-        self.clear_search_paths()
         start = (1, 1)
         end = (self.width - 1, self.height - 2)
         self.breadth_first_search(start, end)
@@ -538,92 +3162,39 @@ class MazeGame:
         """
         Performs Breadth-First Search (BFS) to find a path from `start` to `end` in the maze.
 
-        This method explores the maze using BFS to find the shortest path from the
-        `start` position to the `end` position. Each visited cell is painted in light blue
-        to indicate the path being explored.
+        The search runs at full speed with `solve_bfs` and the resulting trace is played back,
+        painting each visited cell in light blue to indicate the path being explored.
 
         Parameters:
             start (tuple): The starting position in the maze as (x, y).
             end (tuple): The target position (exit) in the maze as (x, y).
 
-        Process:
-            1. Initialize a queue with the starting position and the current path.
-            2. Maintain a set of visited positions to avoid revisiting cells.
-            3. Use a loop to process each position in the queue:
-                - Paint the current cell in light blue and update the canvas.
-                - If the current position is the end, terminate the search.
-                - Otherwise, explore the neighboring cells and add them to the queue if they
-                  are valid and not visited.
-                - Schedule the next step in the search process using `root.after`.
-
-        Notes:
-            - The `step` function is used to manage the search process and update the canvas.
-            - The search continues until the exit is reached or all possible paths are explored.
-
         Example:
             Calling `breadth_first_search((1, 1), (10, 10))` will perform BFS on the maze,
-            visualizing the path exploration with light blue cells.
+            replaying the path exploration with light blue cells.
         """
-        queue = deque([(start, [start])])
-        visited = set()
-
-        def step():
-            if queue:
-                current, path = queue.popleft()
-                if current in visited:
-                    self.root.after(50, step)
-                    return
-                visited.add(current)
-
-                # Paint the current cell
-                self.canvas.create_rectangle(
-                    current[0] * self.cell_size,
-                    current[1] * self.cell_size,
-                    (current[0] + 1) * self.cell_size,
-                    (current[1] + 1) * self.cell_size,
-                    fill="light blue",
-                )
-                self.canvas.update()  # Force update the canvas
-
-                if current == end:
-                    return  # End the search if the exit is reached
-
-                for direction in MOVE_DIRS.values():
-                    next_pos = (current[0] + direction[0], current[1] + direction[1])
-                    if (
-                        0 <= next_pos[0] < self.width
-                        and 0 <= next_pos[1] < self.height
-                        and self.maze[next_pos[1]][next_pos[0]] == 0
-                        and next_pos not in visited
-                    ):
-                        queue.append((next_pos, path + [next_pos]))
-
-                self.root.after(50, step)  # Schedule the next step
-
-        step()
+        self.play_trace(self.trace_for("bfs", start, end))
 
     def dijkstra_bot(self):
         """
         Initiates Dijkstra's Algorithm to find the shortest path from the start to the exit in the maze.
 
-        This method clears any previous search paths from the canvas and then calls the
-        `dijkstra_algorithm` method to begin the Dijkstra's search process.
+        This method calls the `dijkstra_algorithm` method, which records the search and plays it back.
 
         The search starts from the predefined starting point `(1, 1)` and aims to reach
-        the predefined exit point `(self.width - 1, self.height - 2)`. As the search progresses,
+        the predefined exit point `(self.width - 1, self.height - 2)`. As the playback progresses,
         cells are painted to visually indicate the path being explored.
 
         Notes:
-            - The method clears the canvas of previous search paths before initiating Dijkstra's algorithm.
+            - Previous search paths are cleared from the display before the playback starts.
             - The start and end points are fixed for this implementation.
-            - The cells being visited are painted in orange during the search.
+            - The cells being visited are painted in orange during the playback.
 
         Example:
             Calling `dijkstra_bot()` will begin the Dijkstra's algorithm, updating the maze
             visualization with the path being explored and eventually finding the shortest path
             to the exit if it exists.
         """
-        self.clear_search_paths()
         start = (1, 1)
         end = (self.width - 1, self.height - 2)
         self.dijkstra_algorithm(start, end)
@@ -632,94 +3203,38 @@ class MazeGame:
         """
         Performs Dijkstra's Algorithm to find the shortest path from `start` to `end` in the maze.
 
-        This method explores the maze using Dijkstra's algorithm to find the shortest path
-        from the `start` position to the `end` position. Each visited cell is painted in orange
-        to indicate the path being explored.
+        The search runs at full speed with `solve_dijkstra` and the resulting trace is played back,
+        painting each visited cell in orange to indicate the path being explored.
 
         Parameters:
             start (tuple): The starting position in the maze as (x, y).
             end (tuple): The target position (exit) in the maze as (x, y).
 
-        Process:
-            1. Initialize a priority queue (heap) with the starting position and initial cost.
-            2. Maintain a set of visited positions to avoid revisiting cells.
-            3. Use a loop to process each position in the priority queue:
-                - Paint the current cell in orange and update the canvas.
-                - If the current position is the end, terminate the search.
-                - Otherwise, explore the neighboring cells and add them to the queue if they
-                  are valid and not visited.
-                - Schedule the next step in the search process using `root.after`.
-
-        Notes:
-            - The `step` function handles the search process and updates the canvas.
-            - The priority queue ensures that the shortest path is found efficiently.
-
         Example:
             Calling `dijkstra_algorithm((1, 1), (10, 10))` will perform Dijkstra's algorithm on
-            the maze, visualizing the path exploration with orange cells.
+            the maze, replaying the path exploration with orange cells.
         """
-        heap = [(0, start, [start])]  # (cost, position, path)
-        visited = set()
-
-        def step():
-            if heap:
-                cost, current, path = heapq.heappop(heap)
-                if current in visited:
-                    self.root.after(50, step)
-                    return
-                visited.add(current)
-
-                # Paint the current cell
-                self.canvas.create_rectangle(
-                    current[0] * self.cell_size,
-                    current[1] * self.cell_size,
-                    (current[0] + 1) * self.cell_size,
-                    (current[1] + 1) * self.cell_size,
-                    fill="orange",
-                )
-                self.canvas.update()  # Force update the canvas
-
-                if current == end:
-                    return  # End the search if the exit is reached
-
-                for direction in MOVE_DIRS.values():
-                    next_pos = (current[0] + direction[0], current[1] + direction[1])
-                    if (
-                        0 <= next_pos[0] < self.width
-                        and 0 <= next_pos[1] < self.height
-                        and self.maze[next_pos[1]][next_pos[0]] == 0
-                        and next_pos not in visited
-                    ):
-                        heapq.heappush(
-                            heap,
-                            (cost + 1, next_pos, path + [next_pos]),
-                        )
-
-                self.root.after(50, step)  # Schedule the next step
-
-        step()
+        self.play_trace(self.trace_for("dijkstra", start, end))
 
     def a_star_bot(self):
         """
         Initiates A* Algorithm to find the shortest path from the start to the exit in the maze.
 
-        This method clears any previous search paths from the canvas and then calls the
-        `a_star_algorithm` method to begin the A* search process.
+        This method calls the `a_star_algorithm` method, which records the search and plays it back.
 
         The search starts from the predefined starting point `(1, 1)` and aims to reach
-        the predefined exit point `(self.width - 1, self.height - 2)`. As the search progresses,
+        the predefined exit point `(self.width - 1, self.height - 2)`. As the playback progresses,
         cells are painted to visually indicate the path being explored.
 
         Notes:
-            - The method clears the canvas of previous search paths before initiating A* algorithm.
+            - Previous search paths are cleared from the display before the playback starts.
             - The start and end points are fixed for this implementation.
-            - The cells being visited are painted in purple during the search.
+            - The cells being visited are painted in purple during the playback.
 
         Example:
             Calling `a_star_bot()` will begin the A* algorithm, updating the maze visualization
             with the path being explored and eventually finding the shortest path to the exit if it exists.
         """
-        self.clear_search_paths()
         start = (1, 1)
         end = (self.width - 1, self.height - 2)
         self.a_star_algorithm(start, end)
@@ -737,90 +3252,443 @@ class MazeGame:
 
         Notes:
             - The heuristic used is the Manhattan distance, which is suitable for grid-based pathfinding.
+            - This method delegates to the module-level `heuristic` function used by `solve_a_star`.
 
         Example:
             Calling `heuristic((1, 1), (4, 5))` returns 7, which is the Manhattan distance between the two points.
         """
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+        return heuristic(a, b)
 
     def a_star_algorithm(self, start, end):
         """
         Performs A* Algorithm to find the shortest path from `start` to `end` in the maze.
 
-        This method explores the maze using A* algorithm to find the shortest path from the
-        `start` position to the `end` position. Each visited cell is painted in purple to
-        indicate the path being explored.
+        The search runs at full speed with `solve_a_star` and the resulting trace is played back,
+        painting each visited cell in purple to indicate the path being explored.
 
         Parameters:
             start (tuple): The starting position in the maze as (x, y).
             end (tuple): The target position (exit) in the maze as (x, y).
 
-        Process:
-            1. Initialize a priority queue (heap) with the starting position, initial cost,
-               and heuristic estimate.
-            2. Maintain a set of visited positions to avoid revisiting cells.
-            3. Use a loop to process each position in the priority queue:
-                - Paint the current cell in purple and update the canvas.
-                - If the current position is the end, terminate the search.
-                - Otherwise, explore the neighboring cells and add them to the queue if they
-                  are valid and not visited.
-                - Schedule the next step in the search process using `root.after`.
-
         Notes:
             - The heuristic used in A* is the Manhattan distance.
-            - The priority queue ensures that the algorithm efficiently finds the shortest path.
 
         Example:
             Calling `a_star_algorithm((1, 1), (10, 10))` will perform A* algorithm on the maze,
-            visualizing the path exploration with purple cells.
+            replaying the path exploration with purple cells.
+        """
+        self.play_trace(self.trace_for("a_star", start, end))
+
+    def hpa_bot(self):
+        """
+        Initiates hierarchical pathfinding (HPA*) to find a path from the start to the exit in the maze.
+
+        This method calls the `hierarchical_search` method, which records the search and plays it back.
+
+        Notes:
+            - The start and end points are fixed for this implementation.
+            - The entrance nodes expanded by the abstract search are painted in magenta during the playback.
+        """
+        start = (1, 1)
+        end = (self.width - 1, self.height - 2)
+        self.hierarchical_search(start, end)
+
+    def hierarchical_search(self, start, end):
+        """
+        Performs hierarchical pathfinding (HPA*) to find a path from `start` to `end` in the maze.
+
+        The search runs at full speed with `solve_hpa` and the resulting trace is played back,
+        painting each abstract node expanded in magenta.
+
+        Parameters:
+            start (tuple): The starting position in the maze as (x, y).
+            end (tuple): The target position (exit) in the maze as (x, y).
+        """
+        self.play_trace(self.trace_for("hpa", start, end))
+
+    def race_bot(self):
+        """
+        Races every algorithm in `ALGORITHMS` from the start to the exit in parallel.
+
+        The searches run in worker processes via `submit_race`, so the GUI stays responsive;
+        `check_race` polls for the results. Once every algorithm has finished, a table ranked by
+        expanded cells and wall time is shown, and the returned traces are stored so that each
+        algorithm's button replays its search without recomputing it.
+
+        Notes:
+            - Clicking the button while a race is running has no effect.
+            - The start and end points are fixed for this implementation.
+        """
+        if self.race_futures is not None:
+            return
+        start = (1, 1)
+        end = (self.width - 1, self.height - 2)
+        if self.race_pool is None:
+            self.race_pool = ProcessPoolExecutor(
+                max_workers=min(len(ALGORITHMS), os.cpu_count() or 1)
+            )
+        self.race_started = time.perf_counter()
+        self.race_futures = submit_race(self.race_pool, self.maze, start, end)
+        self.renderer.after(STEP_DELAY, self.check_race)
+
+    def check_race(self):
+        """
+        Shows the race results once every algorithm has finished, otherwise checks again later.
+
+        If a search raised an error or the worker pool broke, the error is reported instead and
+        another race can be started.
+        """
+        if not all(future.done() for future in self.race_futures):
+            self.renderer.after(STEP_DELAY, self.check_race)
+            return
+        futures, self.race_futures = self.race_futures, None
+        try:
+            results = rank_results(future.result() for future in futures)
+        except Exception as error:
+            if isinstance(error, BrokenProcessPool):
+                # A worker died; start a new pool on the next race
+                self.race_pool.shutdown(wait=False, cancel_futures=True)
+                self.race_pool = None
+            self.renderer.show_report("Race failed", f"{type(error).__name__}: {error}")
+            return
+        elapsed = time.perf_counter() - self.race_started
+        for result in results:
+            self.traces[result.algorithm] = result.trace
+            key = self.cache_key(result.algorithm, result.trace.start, result.trace.end)
+            self.cache.put(key, result.trace)
+        self.renderer.show_report(
+            f"Race finished in {elapsed * 1000:.0f} ms", format_race(results)
+        )
+
+    def place_items(self, count=ITEM_COUNT):
+        """
+        Starts collection mode with `count` items at random open cells.
+
+        The player is moved back to the entrance, visited paths and search markings are cleared,
+        and the items are drawn in gold. The player wins by collecting every item and then
+        reaching the exit.
+
+        Parameters:
+            count (int): The number of items to place (default: `ITEM_COUNT`).
+        """
+        self.stop_playback()
+        self.route_animation = None
+        reserved = {(0, 1), (self.width - 1, self.height - 2)}  # Entrance and exit
+        open_cells = [
+            (x, y)
+            for y in range(self.height)
+            for x in range(self.width)
+            if self.maze[y][x] == 0 and (x, y) not in reserved
+        ]
+        self.items = set(random.sample(open_cells, min(count, len(open_cells))))
+        self.collected = set()
+        self.visited = set()
+        self.player_pos = [0, 1]
+        self.clear_search_paths()
+        self.draw_player()
+
+    def route_bot(self):
+        """
+        Shows the shortest route from the player's position that collects the remaining items and exits.
+
+        The route is planned with `plan_collection` (exact for up to `HELD_KARP_LIMIT` items) and
+        its cells are painted in cyan one at a time. Items are placed first if there are none.
+
+        Notes:
+            - The distances between all placed items and the exit are cached per maze, so asking
+              for the route again after moving or collecting items only reads the distances from
+              the new position.
+        """
+        if not self.items:
+            self.place_items()
+        self.stop_playback()
+        exit_pos = (self.width - 1, self.height - 2)
+        route = plan_collection(
+            self.maze,
+            tuple(self.player_pos),
+            sorted(self.items - self.collected),
+            exit_pos,
+            self.maze_key,
+            targets=sorted(self.items) + [exit_pos],
+        )
+        self.clear_search_paths()
+        self.animate_path(route.path, "cyan")
+
+    def animate_path(self, path, color):
         """
-        open_set = []
-        heapq.heappush(open_set, (0 + self.heuristic(start, end), 0, start, [start]))
-        visited = set()
+        Paints the cells of `path` in `color` one at a time, every `STEP_DELAY` ms.
+
+        Starting another animation (or placing new items) stops this one.
+        """
+        token = self.route_animation = object()
+        cells = iter(path)
 
         def step():
-            if open_set:
-                _, cost, current, path = heapq.heappop(open_set)
-                if current in visited:
-                    self.root.after(50, step)
-                    return
-                visited.add(current)
-
-                # Paint the current cell
-                self.canvas.create_rectangle(
-                    current[0] * self.cell_size,
-                    current[1] * self.cell_size,
-                    (current[0] + 1) * self.cell_size,
-                    (current[1] + 1) * self.cell_size,
-                    fill="purple",
-                )
-                self.canvas.update()  # Force update the canvas
-
-                if current == end:
-                    return  # End the search if the exit is reached
-
-                for direction in MOVE_DIRS.values():
-                    next_pos = (current[0] + direction[0], current[1] + direction[1])
-                    if (
-                        0 <= next_pos[0] < self.width
-                        and 0 <= next_pos[1] < self.height
-                        and self.maze[next_pos[1]][next_pos[0]] == 0
-                        and next_pos not in visited
-                    ):
-                        heapq.heappush(
-                            open_set,
-                            (
-                                cost + 1 + self.heuristic(next_pos, end),
-                                cost + 1,
-                                next_pos,
-                                path + [next_pos],
-                            ),
-                        )
-
-                self.root.after(50, step)  # Schedule the next step
+            if self.route_animation is not token:
+                return  # Replaced by a newer animation
+            pos = next(cells, None)
+            if pos is None:
+                self.route_animation = None
+                return
+            if pos not in self.items or pos in self.collected:
+                self.renderer.fill_cell(pos[0], pos[1], color)
+            self.renderer.refresh()
+            self.renderer.after(STEP_DELAY, step)
 
         step()
 
+    def cache_key(self, algorithm, start, end):
+        """
+        Returns the `SolveCache` key of a query on this game's maze.
+        """
+        return self.cache.key(self.maze, start, end, algorithm, maze_key=self.maze_key)
+
+    def trace_for(self, algorithm, start, end):
+        """
+        Returns a trace of `algorithm` from `start` to `end`, recording it only on a cache miss.
+
+        Parameters:
+            algorithm (str): The key of the algorithm in `ALGORITHMS`.
+            start (tuple): The starting position in the maze as (x, y).
+            end (tuple): The target position (exit) in the maze as (x, y).
+
+        Returns:
+            SearchTrace: The cached trace for this query, or a newly recorded one.
+        """
+        trace = self.cache.solve(
+            self.maze, start, end, algorithm, maze_key=self.maze_key
+        )
+        self.traces[algorithm] = trace
+        return trace
+
+    def play_trace(self, trace):
+        """
+        Clears the previous search from the display and starts playing `trace`.
+
+        Parameters:
+            trace (SearchTrace): The trace to play, painted in its algorithm's color.
+        """
+        self.stop_playback()
+        self.route_animation = None
+        self.clear_search_paths()
+        self.playback = TracePlayer(self, trace, ALGORITHMS[trace.algorithm].color)
+        self.playback.play()
+
+    def stop_playback(self):
+        """
+        Stops and drops the current playback, before its cells are cleared from the display.
+
+        A paused player would otherwise keep its position and frontier, so resuming or stepping
+        it would no longer match what is painted.
+        """
+        if self.playback is not None:
+            self.playback.pause()
+            self.playback = None
+            self.renderer.update_slider(self.trace_slider, 0, 0)
+
+    def control_playback(self, action, *args):
+        """
+        Calls the `TracePlayer` method named `action` on the current playback, if any.
+
+        Parameters:
+            action (str): The name of the method, e.g. "toggle", "seek" or "faster".
+            *args: Arguments passed to the method (the step for "seek").
+        """
+        if self.playback is not None:
+            getattr(self.playback, action)(*args)
+
+    def save_traces(self, filename=TRACE_FILE):
+        """
+        Saves the maze and every trace recorded on it with `save_traces`.
+
+        Parameters:
+            filename (str): The file to write (default: `TRACE_FILE`).
+        """
+        save_traces(filename, self.maze, self.traces.values())
+
 
 # Run the Maze Game
-MazeGame(WIDTH, HEIGHT, CELL_SIZE)
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maze algorithms solver")
+    parser.add_argument(
+        "--renderer",
+        choices=sorted(RENDERERS),
+        default="tk",
+        help="drawing backend to use (default: tk)",
+    )
+    parser.add_argument(
+        "--width", type=int, default=WIDTH, help=f"maze width, odd (default: {WIDTH})"
+    )
+    parser.add_argument(
+        "--height",
+        type=int,
+        default=HEIGHT,
+        help=f"maze height, odd (default: {HEIGHT})",
+    )
+    parser.add_argument(
+        "--cell-size",
+        type=int,
+        help=f"size of a cell in pixels (default: up to {CELL_SIZE}, smaller for mazes that would "
+        f"not fit in {MAX_BOARD_SIZE} pixels)",
+    )
+    parser.add_argument(
+        "--race",
+        action="store_true",
+        help="race all algorithms on a new maze in parallel and print the results, without a window",
+    )
+    parser.add_argument(
+        "--solve",
+        choices=sorted(ALGORITHMS),
+        help="solve a maze with one algorithm through the cache and print the result, without a window",
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        metavar="N",
+        help="solve N random queries on one maze in shared memory with all CPUs (algorithm from "
+        "--solve, default a_star) and print the throughput, without a window",
+    )
+    parser.add_argument(
+        "--collect",
+        type=int,
+        metavar="K",
+        help="plan the shortest route collecting K random items on a maze and print it, without a window",
+    )
+    parser.add_argument(
+        "--screen",
+        type=int,
+        metavar="N",
+        help="generate N mazes, measure them and print the difficulty statistics, without a window",
+    )
+    parser.add_argument(
+        "--min-difficulty",
+        type=float,
+        default=0.0,
+        help="with --screen, only count mazes at least this difficult (default: 0)",
+    )
+    parser.add_argument(
+        "--load",
+        metavar="FILE",
+        help="play a maze and its traces saved with the Save button",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="random seed, to generate the same maze again"
+    )
+    parser.add_argument(
+        "--cache-file",
+        metavar="FILE",
+        help="keep solve results in FILE between runs",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=SolveCache.MAXSIZE,
+        help=f"maximum number of cached solve results (default: {SolveCache.MAXSIZE})",
+    )
+    args = parser.parse_args()
+    if args.seed is not None:
+        random.seed(args.seed)
+    cache = SolveCache(args.cache_size, args.cache_file)
+    maze, traces = load_traces(args.load) if args.load else (None, ())
+    if args.queries is not None:
+        maze = maze or create_maze(args.width, args.height)
+        open_cells = [
+            (x, y)
+            for y in range(len(maze))
+            for x in range(len(maze[0]))
+            if maze[y][x] == 0
+        ]
+        queries = [
+            (random.choice(open_cells), random.choice(open_cells))
+            for _ in range(args.queries)
+        ]
+        began = time.perf_counter()
+        lengths = array("i")
+        for batch in solve_queries_parallel(
+            maze, queries, args.solve or "a_star", keep_paths=False
+        ):
+            lengths += batch.lengths
+        elapsed = time.perf_counter() - began
+        print(
+            f"Solved {len(lengths)} queries in {elapsed:.2f} s "
+            f"({len(lengths) / elapsed:.0f} queries/s on {os.cpu_count()} CPUs), "
+            f"mean path length {sum(lengths) / max(len(lengths), 1):.1f}"
+        )
+    elif args.solve:
+        maze = maze or create_maze(args.width, args.height)
+        start = (1, 1)
+        end = (len(maze[0]) - 1, len(maze) - 2)
+        began = time.perf_counter()
+        trace = solve(maze, start, end, args.solve, cache=cache)
+        elapsed = time.perf_counter() - began
+        print(
+            f"{ALGORITHMS[args.solve].label}: expanded {len(trace)} cells, "
+            f"path length {len(trace.path)}, {elapsed * 1000:.1f} ms"
+        )
+        stats = cache.stats()
+        print(
+            f"Cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['size']}/{stats['maxsize']} entries"
+        )
+        cache.save()
+    elif args.collect is not None:
+        maze = maze or create_maze(args.width, args.height)
+        end = (len(maze[0]) - 1, len(maze) - 2)
+        open_cells = [
+            (x, y)
+            for y in range(len(maze))
+            for x in range(len(maze[0]))
+            if maze[y][x] == 0 and (x, y) not in ((0, 1), end)
+        ]
+        items = random.sample(open_cells, args.collect)
+        began = time.perf_counter()
+        matrix = distance_matrix(maze, items + [end])
+        planned = time.perf_counter()
+        route = plan_collection(maze, (0, 1), items, end)
+        finished = time.perf_counter()
+        print(f"Items in order: {route.items}")
+        print(
+            f"Route length {route.length} ({'optimal' if route.exact else '2-opt'}), "
+            f"{len(matrix.targets)} BFS in {(planned - began) * 1000:.1f} ms, "
+            f"planned in {(finished - planned) * 1000:.1f} ms"
+        )
+    elif args.screen is not None:
+        if maze:
+            print(analyze_maze(maze))
+        began = time.perf_counter()
+        accepted = [
+            stats
+            for _, stats in screen_mazes(
+                args.screen, args.width, args.height, args.min_difficulty
+            )
+        ]
+        elapsed = time.perf_counter() - began
+        print(
+            f"Screened {args.screen} mazes in {elapsed:.2f} s "
+            f"({args.screen / elapsed:.0f} mazes/s), {len(accepted)} accepted"
+        )
+        if accepted:
+            for field in ("solution_length", "dead_ends", "diameter", "difficulty"):
+                values = sorted(getattr(stats, field) for stats in accepted)
+                print(
+                    f"{field}: min {values[0]:g}, median {values[len(values) // 2]:g}, "
+                    f"max {values[-1]:g}"
+                )
+    elif args.race:
+        maze = maze or create_maze(args.width, args.height)
+        start = (1, 1)
+        end = (len(maze[0]) - 1, len(maze) - 2)
+        began = time.perf_counter()
+        results = race(maze, start, end, keep_traces=False)
+        print(format_race(results))
+        print(f"Race finished in {(time.perf_counter() - began) * 1000:.0f} ms")
+    else:
+        MazeGame(
+            args.width,
+            args.height,
+            args.cell_size,
+            renderer=RENDERERS[args.renderer],
+            maze=maze,
+            traces=traces,
+            cache=cache,
+        )